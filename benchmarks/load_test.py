@@ -0,0 +1,358 @@
+# benchmarks/load_test.py
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import quote, urlencode, urlsplit
+
+import numpy as np
+
+# Werkzeug ("[28/Feb/2025 17:40:48]") and common/combined log format
+# ("[28/Feb/2025:17:40:48 +0000]", as gunicorn writes) access log lines
+LOG_LINE = re.compile(
+    r'(?P<host>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+'
+)
+LOG_TIME_FORMATS = ('%d/%b/%Y %H:%M:%S', '%d/%b/%Y:%H:%M:%S %z')
+
+# Longest pause kept between two requests of a recorded session, in seconds
+MAX_THINK = 30.0
+
+
+def _parse_time(text):
+    for fmt in LOG_TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_sessions(lines, gap=600):
+    """
+    Group the GET requests of an access log into sessions
+
+    A session is the requests of one client host, split where it was idle
+    for more than gap seconds. Each is a list of (pause before, path) pairs.
+    """
+    by_host = defaultdict(list)
+    for line in lines:
+        match = LOG_LINE.search(line)
+        if not match or match['method'] != 'GET':
+            continue
+        timestamp = _parse_time(match['time'])
+        if timestamp is not None:
+            by_host[match['host']].append((timestamp, match['path']))
+
+    sessions = []
+    for requests in by_host.values():
+        session = []
+        last = None
+        for timestamp, path in requests:
+            if last is not None and timestamp - last > gap:
+                sessions.append(session)
+                session = []
+            session.append((0.0 if last is None or not session else min(timestamp - last, MAX_THINK), path))
+            last = timestamp
+        if session:
+            sessions.append(session)
+    return sessions
+
+
+def synthesize_session(rng, owners, reports):
+    """
+    One analyst session with the request mix of the page: load, pick owners,
+    drill into the diagram and open bursts of report details
+
+    owners are owner names, reports maps each owner to some of its report names.
+    """
+    def think(mean):
+        return min(rng.expovariate(1 / mean), MAX_THINK)
+
+    def view(owner):
+        query = {'owner': owner, 'quarter': '', 'year': '', 'format': 'ndjson'}
+        return '/get_sankey?' + urlencode(query, quote_via=quote)
+
+    def timeline(owner):
+        return '/get_sankey_timeline?' + urlencode({'owner': owner}, quote_via=quote)
+
+    session = [(0.0, '/'), (0.0, '/static/js/script.js'), (0.0, '/static/css/style.css'),
+               (0.0, '/get_owners')]
+    session.append((0.0, view('All Owners')))
+    owner = 'All Owners'
+    for _ in range(rng.randint(1, 4)):
+        if rng.random() < 0.5 and owners:
+            owner = rng.choice(owners)
+            session.append((think(5), view(owner)))
+        # Step through the roadmap quarters, which loads the owner's timeline
+        if rng.random() < 0.3:
+            session.append((think(5), timeline(owner)))
+        # Drill into a node, then open a burst of its reports
+        session.append((think(5), '/get_reports?' + urlencode(
+            {'owner': owner, 'quarter': '', 'year': '', 'node': rng.randint(0, 5)}, quote_via=quote)))
+        names = reports.get(owner) or reports.get('All Owners') or []
+        for name in rng.sample(names, min(len(names), rng.randint(1, 6))):
+            session.append((think(8), '/get_report_details?' + urlencode({'report_name': name}, quote_via=quote)))
+    return session
+
+
+def route(path):
+    return urlsplit(path).path
+
+
+class Recorder:
+    """Thread-safe collector of request outcomes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.started = time.perf_counter()
+        self.completed = []  # completion times, for throughput over time
+
+    def record(self, path, seconds, ok):
+        with self._lock:
+            name = route(path)
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+            self.completed.append(time.perf_counter())
+
+    def summary(self, elapsed):
+        routes = {}
+        with self._lock:
+            for name, samples in sorted(self.latencies.items()):
+                ms = np.asarray(samples) * 1000
+                routes[name] = {
+                    'requests': len(samples),
+                    'errors': self.errors[name],
+                    'error_rate': self.errors[name] / len(samples),
+                    'p50_ms': float(np.percentile(ms, 50)),
+                    'p95_ms': float(np.percentile(ms, 95)),
+                    'p99_ms': float(np.percentile(ms, 99)),
+                    'max_ms': float(ms.max()),
+                }
+            total = sum(len(samples) for samples in self.latencies.values())
+            errors = sum(self.errors.values())
+            seconds = np.asarray(self.completed) - self.started
+        return {
+            'requests': total,
+            'errors': errors,
+            'error_rate': errors / total if total else 0.0,
+            'throughput_rps': total / elapsed if elapsed else 0.0,
+            'throughput_per_second': np.bincount(seconds.astype(np.int64)).tolist() if total else [],
+            'routes': routes,
+        }
+
+
+def request(connection, path, timeout):
+    """GET path on a keep-alive connection; returns (status, connection), reconnecting if needed"""
+    for attempt in range(2):
+        try:
+            connection.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            return response.status, connection
+        except (http.client.HTTPException, ConnectionError):
+            connection.close()
+            connection = http.client.HTTPConnection(connection.host, connection.port, timeout=timeout)
+            if attempt:
+                raise
+    return None, connection
+
+
+def run_user(host, port, sessions, recorder, stop, think_scale, timeout, seed):
+    """One virtual analyst: replay sessions back to back until stop is set"""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    while not stop.is_set():
+        for pause, path in sessions(rng):
+            if stop.wait(pause * think_scale):
+                break
+            start = time.perf_counter()
+            try:
+                status, connection = request(connection, path, timeout)
+                ok = status is not None and status < 400
+            except OSError:
+                ok = False
+            recorder.record(path, time.perf_counter() - start, ok)
+    connection.close()
+
+
+def rss_mb(pid):
+    """Resident memory of a process and its children, in MB (Linux /proc), or None"""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            if current == pid:
+                return None
+    return total / 1024
+
+
+def run_level(host, port, sessions, users, duration, ramp, think_scale, timeout, server_pid, seed):
+    """Run users virtual analysts for duration seconds, starting them evenly over ramp seconds"""
+    recorder = Recorder()
+    stop = threading.Event()
+    rss = []
+    started = time.perf_counter()
+
+    def sample_rss():
+        while not stop.wait(1.0):
+            value = rss_mb(server_pid)
+            if value is not None:
+                rss.append((round(time.perf_counter() - started, 1), round(value, 1)))
+
+    threads = []
+    if server_pid:
+        threads.append(threading.Thread(target=sample_rss, daemon=True))
+        threads[-1].start()
+    for i in range(users):
+        if stop.wait(ramp / users if i else 0):
+            break
+        thread = threading.Thread(target=run_user, daemon=True,
+                                  args=(host, port, sessions, recorder, stop, think_scale, timeout, seed + i))
+        thread.start()
+        threads.append(thread)
+
+    stop.wait(max(duration - (time.perf_counter() - started), 0))
+    stop.set()
+    for thread in threads:
+        thread.join(timeout)
+
+    result = recorder.summary(time.perf_counter() - started)
+    result.update(users=users, rss_mb=rss)
+    return result
+
+
+def start_server(command, port):
+    """Start the app with command (PORT set) and wait until it answers"""
+    # In its own process group, so stop_server() also stops the workers it forks
+    # (its access log on stdout is dropped; errors still reach stderr)
+    process = subprocess.Popen(command, shell=True, env=dict(os.environ, PORT=str(port)), start_new_session=True,
+                               stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with status {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/get_owners')
+            connection.getresponse().read()
+            connection.close()
+            return process
+        except OSError:
+            time.sleep(0.5)
+    stop_server(process)
+    raise SystemExit("Server did not start within 120s")
+
+
+def stop_server(process):
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait()
+
+
+def fetch_json(host, port, path):
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    connection.request('GET', path)
+    data = json.loads(connection.getresponse().read())
+    connection.close()
+    return data
+
+
+def synthetic_sessions(host, port, owner_sample=20):
+    """Session factory for synthesized traffic, drawing owners and report names from the server"""
+    owners = fetch_json(host, port, '/get_owners')['owners'][1:]
+    owners = owners[:owner_sample]
+    reports = {}
+    for owner in owners:
+        data = fetch_json(host, port, '/search?' + urlencode({'report_owner': owner, 'limit': 100}))
+        reports[owner] = [r['report_name'] for r in data.get('reports', []) if r.get('report_name')]
+    reports['All Owners'] = [name for names in reports.values() for name in names]
+    return lambda rng: synthesize_session(rng, owners, reports)
+
+
+def print_level(result):
+    print(f"\n{result['users']} concurrent users: {result['requests']} requests, "
+          f"{result['throughput_rps']:.1f} req/s, {result['error_rate']:.1%} errors")
+    print(f"{'route':28} {'requests':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in result['routes'].items():
+        print(f"{name:28} {stats['requests']:9} {stats['errors']:7} {stats['p50_ms']:9.1f} "
+              f"{stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+    if result['rss_mb']:
+        values = [value for _, value in result['rss_mb']]
+        print(f"server RSS: start {values[0]:.0f} MB, peak {max(values):.0f} MB, end {values[-1]:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded or synthesized analyst traffic against the app")
+    parser.add_argument('--url', default='http://127.0.0.1:5008', help="Base URL of the app")
+    parser.add_argument('--log', help="Access log to replay (Werkzeug or common/combined log format); "
+                                      "sessions are synthesized when omitted")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 5, 10, 20],
+                        help="Concurrent users, one run per value (e.g. 10 20 40 80)")
+    parser.add_argument('--duration', type=float, default=60, help="Seconds per concurrency level")
+    parser.add_argument('--ramp', type=float, default=10, help="Seconds over which users are started")
+    parser.add_argument('--think-scale', type=float, default=1.0,
+                        help="Multiplier of pauses between requests (0 = back to back)")
+    parser.add_argument('--timeout', type=float, default=60, help="Request timeout, in seconds")
+    parser.add_argument('--start', metavar='COMMAND', nargs='?', const='gunicorn -c gunicorn.conf.py wsgi:application',
+                        help="Start the app locally with COMMAND (default: gunicorn) on the --url port")
+    parser.add_argument('--server-pid', type=int, help="PID of an already running server, to sample its RSS")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="Also write the results, with RSS over time, as JSON")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    server = start_server(args.start, port) if args.start else None
+    server_pid = server.pid if server else args.server_pid
+    try:
+        if args.log:
+            with open(args.log, errors='replace') as f:
+                recorded = parse_sessions(f)
+            if not recorded:
+                raise SystemExit(f"No GET requests found in {args.log}")
+            print(f"Replaying {len(recorded)} recorded sessions "
+                  f"({sum(len(s) for s in recorded)} requests) from {args.log}")
+            sessions = lambda rng: rng.choice(recorded)  # noqa: E731
+        else:
+            sessions = synthetic_sessions(host, port)
+
+        results = []
+        for users in args.concurrency:
+            result = run_level(host, port, sessions, users, args.duration, args.ramp, args.think_scale,
+                               args.timeout, server_pid, args.seed)
+            print_level(result)
+            results.append(result)
+    finally:
+        if server:
+            stop_server(server)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# benchmarks/run_benchmarks.py
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as dashboard  # noqa: E402
+from benchmarks.synthetic import parse_cardinality, write_catalog  # noqa: E402
+from src.catalog import ReportCatalog  # noqa: E402
+from src.figure_json import figure_json  # noqa: E402
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+
+def measure(func, repeat):
+    """Time func over repeat runs (after one warm-up) and record the peak memory of one run"""
+    result = func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'mean_ms': float(np.mean(timings)),
+        'peak_mb': peak / 2 ** 20,
+    }
+    if hasattr(result, 'data'):
+        stats['payload_bytes'] = len(result.data)
+    return stats
+
+
+def check_figure_json(df, owners):
+    """
+    Check that figure_json() encodes each figure exactly as go.Figure(...).to_json() would
+
+    Returns the (owner, quarter, year) cases whose decoded output differs.
+    """
+    mismatches = []
+    for owner in owners:
+        for quarter, year in (('', ''), ('2', '2026')):
+            fig = dashboard.build_sankey(df, owner, quarter, year)[0]
+            expected = json.loads(dashboard.go.Figure(fig).to_json())
+            if json.loads(figure_json(fig)) != expected:
+                mismatches.append((owner, quarter, year))
+    return mismatches
+
+
+def run_scale(rows, cardinality, repeat, workdir, seed, xlsx=False):
+    """Run every benchmark against a synthetic catalog of the given size"""
+    csv_path = write_catalog(os.path.join(workdir, f"reports_{rows}.csv"), rows, cardinality, seed)
+    cache_path = os.path.join(workdir, f"reports_{rows}.feather")
+
+    results = {}
+    results['load_data[csv]'] = measure(lambda: ReportCatalog(csv_path, cache_path='').frame, repeat)
+    ReportCatalog(csv_path, cache_path=cache_path).refresh()
+    results['load_data[feather]'] = measure(lambda: ReportCatalog(csv_path, cache_path=cache_path).frame, repeat)
+
+    if xlsx:
+        # Streaming workbook parse; slow enough that a few runs suffice
+        xlsx_path = write_catalog(os.path.join(workdir, f"reports_{rows}.xlsx"), rows, cardinality, seed)
+        results['load_data[xlsx]'] = measure(lambda: ReportCatalog(xlsx_path, cache_path='').frame,
+                                             max(repeat // 10, 1))
+        if not ReportCatalog(xlsx_path, cache_path='').frame.equals(ReportCatalog(csv_path, cache_path='').frame):
+            raise SystemExit(f"Catalog read from .xlsx differs from the CSV @ {rows} rows")
+
+    # Point the app at the synthetic catalog
+    dashboard.catalog = ReportCatalog(csv_path, cache_path=cache_path)
+    df = dashboard.load_data()
+    owner = df['report_owner'].value_counts().index[0]
+    report_name = df['report_name'].iloc[len(df) // 2]
+    criteria = {'report_owner': owner, 'automation_level': 'Semi'}
+    index = dashboard.report_index()
+
+    results['apply_transformation'] = measure(lambda: dashboard.apply_transformation(df, '2', '2026'), repeat)
+    results['create_sankey[all]'] = measure(lambda: dashboard.create_sankey(df, 'All Owners', '', ''), repeat)
+    results['create_sankey[owner,projected]'] = measure(
+        lambda: dashboard.create_sankey(df, owner, '2', '2026'), repeat)
+    figure = dashboard.build_sankey(df, 'All Owners', '', '')[0]
+    results['figure[go.Figure]'] = measure(lambda: dashboard.go.Figure(figure).to_json(), repeat)
+    results['figure[figure_json]'] = measure(lambda: figure_json(figure), repeat)
+    results['find_reports[scan]'] = measure(lambda: dashboard.find_reports(df, criteria), repeat)
+    results['find_reports[index]'] = measure(lambda: dashboard.find_reports(df, criteria, index=index), repeat)
+
+    mismatches = check_figure_json(df, ['All Owners', owner])
+    if mismatches:
+        raise SystemExit(f"figure_json output differs from go.Figure for {mismatches} @ {rows} rows")
+
+    client = dashboard.app.test_client()
+
+    def sankey(owner_name, response_format=None, cached=False, **options):
+        def request():
+            if not cached:
+                dashboard.sankey_cache.clear()
+                dashboard.sankey_views.clear()
+            query = {'owner': owner_name, 'quarter': '', 'year': '', **options}
+            if response_format:
+                query['format'] = response_format
+            return client.get('/get_sankey', query_string=query)
+        return request
+
+    results['/get_sankey[all]'] = measure(sankey('All Owners'), repeat)
+    results['/get_sankey[all,compact]'] = measure(sankey('All Owners', 'compact'), repeat)
+    results['/get_sankey[all,counts]'] = measure(sankey('All Owners', 'counts'), repeat)
+    results['/get_sankey[all,counts,top 10]'] = measure(sankey('All Owners', 'counts', top=10, min_link=2), repeat)
+    results['/get_sankey[owner]'] = measure(sankey(owner), repeat)
+
+    def first_line(owner_name):
+        # Time to the first NDJSON line (figure and counts) of a streamed response
+        def request():
+            dashboard.sankey_cache.clear()
+            dashboard.sankey_views.clear()
+            response = client.get('/get_sankey', query_string={'owner': owner_name, 'format': 'ndjson'},
+                                  buffered=False)
+            line = next(iter(response.response))
+            response.close()
+            return line
+        return request
+
+    results['/get_sankey[all,ndjson first line]'] = measure(first_line('All Owners'), repeat)
+
+    def timeline(owner_name):
+        def request():
+            dashboard.sankey_cache.clear()
+            dashboard.sankey_views.clear()
+            return client.get('/get_sankey_timeline', query_string={'owner': owner_name})
+        return request
+
+    results['/get_sankey_timeline[all]'] = measure(timeline('All Owners'), repeat)
+    results['/get_sankey_timeline[owner]'] = measure(timeline(owner), repeat)
+    results['/get_sankey[all,cached]'] = measure(sankey('All Owners', cached=True), repeat)
+    results['/get_reports[largest node]'] = measure(
+        lambda: client.get('/get_reports', query_string={'owner': 'All Owners', 'node': 0}), repeat)
+    results['/search[type-ahead]'] = measure(
+        lambda: client.get('/search', query_string={'q': report_name[:-1], 'limit': 8}), repeat)
+    results['/search[filters]'] = measure(
+        lambda: client.get('/search', query_string={'report_owner': owner, 'automation_level': 'Semi'}), repeat)
+    results['/get_owners'] = measure(lambda: client.get('/get_owners'), repeat)
+    results['/get_report_details'] = measure(
+        lambda: client.get('/get_report_details', query_string={'report_name': report_name}), repeat)
+
+    return results
+
+
+def print_results(rows, results, baseline=None, threshold=1.25):
+    """Print one scale's results; returns the names of benchmarks that regressed against baseline"""
+    regressions = []
+    print(f"\n{rows:,} rows")
+    print(f"{'benchmark':34} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak MB':>9} {'bytes':>10} {'vs base':>8}")
+    for name, stats in results.items():
+        ratio = ''
+        base = (baseline or {}).get(name)
+        if base and base['p50_ms'] > 0:
+            change = stats['p50_ms'] / base['p50_ms']
+            ratio = f"{change:.2f}x"
+            if change > threshold:
+                ratio += ' !'
+                regressions.append(name)
+        print(f"{name:34} {stats['p50_ms']:10.2f} {stats['p95_ms']:10.2f} {stats['p99_ms']:10.2f} "
+              f"{stats['peak_mb']:9.1f} {stats.get('payload_bytes', ''):>10} {ratio:>8}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Sankey pipeline on synthetic catalogs")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Catalog sizes to benchmark (e.g. 1000 100000 1000000)")
+    parser.add_argument('--cardinality', nargs='*', metavar='COLUMN=N',
+                        help="Distinct values per column, e.g. Report_Owner=500 Stakeholder=2000")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed runs per benchmark")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--xlsx', action='store_true', help="Also time loading the catalog from an .xlsx workbook")
+    parser.add_argument('--save-baseline', metavar='NAME', help="Save results as a named baseline")
+    parser.add_argument('--compare', metavar='NAME', help="Compare p50 latencies against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="p50 slowdown ratio reported as a regression (default 1.25)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as f:
+            baseline = json.load(f)
+
+    cardinality = parse_cardinality(args.cardinality)
+    all_results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            results = run_scale(rows, cardinality, args.repeat, workdir, args.seed, args.xlsx)
+            all_results[str(rows)] = results
+            regressions += [f"{name} @ {rows}" for name in
+                            print_results(rows, results, baseline.get(str(rows)), args.threshold)]
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save_baseline}.json")
+        with open(path, 'w') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\nSaved baseline to {path}")
+
+    if regressions:
+        print(f"\nRegressions over {args.threshold}x: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/synthetic.py
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Header of the generated file, in the column order load_data() expects
+HEADER = ['Data_Source', 'Report_Name', 'Stakeholder', 'Program',
+          'Delivery_Schedule', 'Report_Owner', 'Output_Type', 'Automation_Level']
+
+# Distinct values per column at the default scale
+DEFAULT_CARDINALITY = {
+    'Data_Source': 25,
+    'Stakeholder': 300,
+    'Program': 40,
+    'Report_Owner': 200,
+}
+
+DELIVERY_SCHEDULES = ['Daily', 'Weekly', 'Monthly', 'Quarterly', 'Ad hoc']
+OUTPUT_TYPES = ['Excel', 'Email', 'Web UI', 'PDF', 'Tableau Extract']
+AUTOMATION_LEVELS = ['Manual', 'Semi', 'Fully', 'Tableau']
+
+
+def skewed_choice(rng, values, size, skew=1.2):
+    """Draw values with a Zipf-like skew, like real owner/stakeholder distributions"""
+    weights = 1.0 / np.arange(1, len(values) + 1) ** skew
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def generate_catalog(rows, cardinality=None, seed=0, missing_names=0.01):
+    """Build a synthetic reports.csv frame with the given row count and column cardinalities"""
+    cardinality = {**DEFAULT_CARDINALITY, **(cardinality or {})}
+    rng = np.random.default_rng(seed)
+
+    def labels(prefix, col):
+        return [f"{prefix} {i}" for i in range(cardinality[col])]
+
+    names = np.array([f"Report {i:07d}" for i in range(rows)], dtype=object)
+    names[rng.random(rows) < missing_names] = None
+
+    return pd.DataFrame({
+        'Data_Source': skewed_choice(rng, labels('Source', 'Data_Source'), rows),
+        'Report_Name': names,
+        'Stakeholder': skewed_choice(rng, labels('Stakeholder', 'Stakeholder'), rows),
+        'Program': skewed_choice(rng, labels('Program', 'Program'), rows),
+        'Delivery_Schedule': skewed_choice(rng, DELIVERY_SCHEDULES, rows),
+        'Report_Owner': skewed_choice(rng, labels('Owner', 'Report_Owner'), rows),
+        'Output_Type': skewed_choice(rng, OUTPUT_TYPES, rows),
+        'Automation_Level': rng.choice(AUTOMATION_LEVELS, size=rows, p=[0.25, 0.4, 0.2, 0.15]),
+    }, columns=HEADER)
+
+
+def write_workbook(df, path):
+    """Write df as the first sheet of an .xlsx workbook, row by row"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Reports')
+    sheet.append(list(df.columns))
+    for row in df.itertuples(index=False):
+        sheet.append([None if pd.isna(value) else value for value in row])
+    workbook.save(path)
+
+
+def write_catalog(path, rows, cardinality=None, seed=0):
+    """Write a synthetic catalog as CSV, or as a workbook if path ends in .xlsx"""
+    df = generate_catalog(rows, cardinality, seed)
+    if path.endswith('.xlsx'):
+        write_workbook(df, path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def parse_cardinality(items):
+    """Parse ['Report_Owner=500', ...] into {'Report_Owner': 500, ...}"""
+    result = {}
+    for item in items or []:
+        col, _, value = item.partition('=')
+        if col not in DEFAULT_CARDINALITY:
+            raise argparse.ArgumentTypeError(f"Unknown column '{col}', expected one of {list(DEFAULT_CARDINALITY)}")
+        result[col] = int(value)
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a synthetic report catalog")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--out', default='file/reports.csv', help="Output file (.csv or .xlsx)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cardinality', nargs='*', metavar='COLUMN=N',
+                        help=f"Distinct values per column, e.g. Report_Owner=500 (columns: {', '.join(DEFAULT_CARDINALITY)})")
+    args = parser.parse_args()
+
+    write_catalog(args.out, args.rows, parse_cardinality(args.cardinality), args.seed)
+    print(f"Wrote {args.rows} reports to {args.out}")
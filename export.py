@@ -0,0 +1,181 @@
+# export.py
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from src.catalog import write_atomic
+
+try:
+    import kaleido  # noqa: F401
+except ImportError:  # SVG export is optional; it needs a local renderer
+    kaleido = None
+
+FORMATS = ('html', 'json', 'svg')
+MANIFEST = 'manifest.json'
+
+
+def slug(text):
+    """File-system safe name for an owner, unique even when two names slug alike"""
+    base = re.sub(r'[^A-Za-z0-9]+', '-', text).strip('-').lower() or 'owner'
+    return f"{base}-{hashlib.sha1(text.encode()).hexdigest()[:6]}"
+
+
+def quarter_name(quarter, year):
+    return f"{year}-q{quarter}" if quarter else 'current'
+
+
+def render_options(formats, plotlyjs=True):
+    """Options each format is rendered with; a figure is rewritten when they change"""
+    options = {
+        'html': {'include_plotlyjs': plotlyjs, 'full_html': True},
+        'json': {},
+        'svg': {'format': 'svg'},
+    }
+    return {fmt: options[fmt] for fmt in formats}
+
+
+def export_owner(owner, out_dir, formats, previous, top=None, min_link=None, plotlyjs=True):
+    """
+    Write every roadmap quarter of one owner's diagram; returns their manifest entries
+
+    Figures whose JSON spec hashes the same as in previous (the last manifest's
+    entries by path stem), that were rendered with the same options and whose
+    files all exist are not written again.
+    """
+    import app as dashboard
+    from src.figure_json import figure_json
+    from src.projection import DEFAULT_ROADMAP, Projection
+
+    df = dashboard.load_data()
+    cube = dashboard.link_cube()
+    owner_df = df if owner == "All Owners" else df[df['report_owner'] == owner]
+    projection = Projection(owner_df, DEFAULT_ROADMAP)
+
+    owner_dir = slug(owner)
+    os.makedirs(os.path.join(out_dir, owner_dir), exist_ok=True)
+    if plotlyjs == 'directory' and 'html' in formats:
+        # HTML files load plotly.js from their own directory
+        script = os.path.join(out_dir, owner_dir, 'plotly.min.js')
+        if not os.path.exists(script):
+            write_atomic(script, get_plotlyjs().encode())
+
+    render = render_options(formats, plotlyjs)
+    entries = []
+    for quarter, year in dashboard.ROADMAP_QUARTERS:
+        stem = f"{owner_dir}/{quarter_name(quarter, year)}"
+        fig = dashboard.build_sankey(df, owner, quarter, year, cube=cube, top=top, min_link=min_link,
+                                     projection=projection)[0]
+        body = figure_json(fig).encode()
+        digest = hashlib.sha256(body).hexdigest()
+        files = [f"{stem}.{fmt}" for fmt in formats]
+
+        entry = {"name": stem, "owner": owner, "quarter": quarter, "year": year, "hash": digest, "render": render,
+                 "files": files}
+        last = previous.get(stem)
+        if (last and last['hash'] == digest and last.get('render') == render
+                and all(os.path.exists(os.path.join(out_dir, f)) for f in files)):
+            entries.append(dict(entry, skipped=True))
+            continue
+
+        figure = None
+        for fmt, path in zip(formats, files):
+            path = os.path.join(out_dir, path)
+            if fmt == 'json':
+                write_atomic(path, body)
+                continue
+            if figure is None:
+                figure = json.loads(body)
+            if fmt == 'html':
+                write_atomic(path, pio.to_html(figure, validate=False, **render['html']).encode())
+            elif fmt == 'svg':
+                write_atomic(path, pio.to_image(figure, validate=False, **render['svg']))
+        entries.append(dict(entry, skipped=False))
+    return entries
+
+
+def load_manifest(out_dir):
+    """Entries of the previous export by path stem, or {} if there is none"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            figures = json.load(f)['figures']
+    except (OSError, ValueError, KeyError):
+        return {}
+    return {entry['name']: entry for entry in figures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every owner x roadmap quarter Sankey to static files")
+    parser.add_argument('--out', default='exports', help="Output directory (default exports)")
+    parser.add_argument('--catalog', help="Report catalog (CSV path or database URL); defaults to REPORT_CATALOG")
+    parser.add_argument('--owners', nargs='*', help="Owners to export (default: All Owners and every owner)")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['html', 'json', 'svg'],
+                        help="Files written per figure; svg is skipped when kaleido is not installed")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=0, help="Nodes kept per stage, the rest folded (0 = all)")
+    parser.add_argument('--min-link', type=int, default=0, help="Fewest reports shown as a link (0 = all)")
+    parser.add_argument('--plotlyjs', choices=['inline', 'cdn', 'directory'], default='inline',
+                        help="How HTML files load plotly.js: embedded (self-contained), from the CDN, "
+                             "or from one plotly.min.js per owner directory")
+    parser.add_argument('--force', action='store_true', help="Rewrite every file, even if unchanged")
+    args = parser.parse_args()
+
+    if args.catalog:
+        # Read by app at import, here and in every worker
+        os.environ['REPORT_CATALOG'] = args.catalog
+
+    import app as dashboard
+
+    formats = [fmt for fmt in args.formats if fmt != 'svg' or kaleido is not None]
+    if len(formats) < len(args.formats):
+        print("kaleido is not installed; skipping SVG", file=sys.stderr)
+
+    # Load the catalog and link cube before forking, so workers share them
+    started = time.perf_counter()
+    df = dashboard.load_data()
+    dashboard.link_cube()
+    owners = args.owners or ["All Owners"] + sorted(df['report_owner'].dropna().unique().tolist())
+
+    os.makedirs(args.out, exist_ok=True)
+    existing = load_manifest(args.out)
+    previous = {} if args.force else existing
+    plotlyjs = {'inline': True, 'cdn': 'cdn', 'directory': 'directory'}[args.plotlyjs]
+
+    figures = []
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        futures = {
+            pool.submit(export_owner, owner, args.out, formats,
+                        {stem: entry for stem, entry in previous.items() if entry['owner'] == owner},
+                        args.top or None, args.min_link or None, plotlyjs): owner
+            for owner in owners
+        }
+        for future in as_completed(futures):
+            figures.extend(future.result())
+
+    written = sum(not entry['skipped'] for entry in figures)
+
+    # Keep the entries of owners this run did not export, so a partial run does not forget them
+    exported = set(owners)
+    merged = {stem: entry for stem, entry in existing.items() if entry['owner'] not in exported}
+    merged.update((entry['name'], entry) for entry in figures)
+    manifest = {
+        "catalog_version": dashboard.catalog.version,
+        "generated_at": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        "formats": formats,
+        "figures": sorted(merged.values(), key=lambda entry: entry['name']),
+    }
+    write_atomic(os.path.join(args.out, MANIFEST), json.dumps(manifest, indent=2).encode())
+    print(f"Exported {len(owners)} owners, {len(figures)} figures ({written} written, "
+          f"{len(figures) - written} unchanged) to {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# gunicorn.conf.py
+# Production server settings: gunicorn -c gunicorn.conf.py wsgi:application
+import gc
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5008')}"
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('WEB_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', 120))
+graceful_timeout = 30
+accesslog = '-'
+
+# Load the app (and the catalog) in the master so workers share it copy-on-write
+preload_app = True
+
+# How often the master checks the catalog file for changes, in seconds (0 disables)
+catalog_poll_seconds = float(os.environ.get('CATALOG_POLL_SECONDS', 30))
+
+
+def when_ready(server):
+    if catalog_poll_seconds <= 0:
+        return
+
+    catalog = sys.modules['app'].catalog
+    master_pid = os.getpid()
+
+    def watch():
+        # Reload the catalog in the master, then HUP so fresh workers fork from it
+        # while the old ones finish their in-flight requests
+        while True:
+            threading.Event().wait(catalog_poll_seconds)
+            try:
+                changed = catalog.refresh()
+            except OSError as e:
+                server.log.warning("Catalog check failed: %s", e)
+                continue
+            if changed:
+                server.log.info("Report catalog changed (version %s), reloading workers", catalog.version)
+                sys.modules['wsgi'].create_app()
+                os.kill(master_pid, signal.SIGHUP)
+
+    threading.Thread(target=watch, name='catalog-watcher', daemon=True).start()
+
+
+def pre_fork(server, worker):
+    # Keep the preloaded objects out of the collector so it does not touch (and copy) their pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Workers leave change detection to the master, which reloads and restarts them
+    if catalog_poll_seconds > 0:
+        sys.modules['app'].catalog.auto_refresh = False
@@ -0,0 +1,90 @@
+# src/bucketing.py
+
+import numpy as np
+import pandas as pd
+
+from src.links import StageLinks
+
+
+def other_label(count):
+    """Label of the node standing for count folded values"""
+    return f"Other ({count})"
+
+
+def _volumes(labels, values):
+    return pd.Series(values, dtype=np.int64).groupby(np.asarray(labels, dtype=object), sort=False).sum()
+
+
+def _merge_links(links, source_map, target_map, min_value):
+    """Relabel a link layer, summing links that now join the same nodes, and drop links below min_value"""
+    merged = {}
+    for source, target, value, rows in zip(links.source, links.target, links.value.tolist(), links.rows):
+        key = (source_map.get(source, source), target_map.get(target, target))
+        entry = merged.get(key)
+        if entry is None:
+            merged[key] = [value, [rows]]
+        else:
+            entry[0] += value
+            entry[1].append(rows)
+
+    kept = [(key, value, parts) for key, (value, parts) in merged.items() if value >= min_value]
+    return StageLinks(
+        source=np.array([key[0] for key, _, _ in kept], dtype=object),
+        target=np.array([key[1] for key, _, _ in kept], dtype=object),
+        value=np.array([value for _, value, _ in kept], dtype=np.int64),
+        # Rows of merged links are re-sorted to keep frame order
+        rows=[parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts)) for _, _, parts in kept],
+    )
+
+
+def bucket_stages(stages, layers, top=None, min_value=None):
+    """
+    Keep the top nodes of each stage, fold the rest into one "Other (n)" node and drop small links
+
+    stages holds the node labels of each stage, layers the StageLinks between
+    consecutive stages. Nodes are ranked by the reports flowing into them (out
+    of them for the first stage); with more than top nodes, the remaining n
+    become "Other (n)", last in the stage. Links of at least min_value reports
+    are kept, and nodes left without any link are dropped.
+
+    Returns (stages, layers, members), where members[i] maps every node label
+    of stage i to the list of values it stands for.
+    """
+    mappings = []
+    members = []
+    for i, nodes in enumerate(stages):
+        if i == 0:
+            volumes = _volumes(layers[0].source, layers[0].value) if layers else pd.Series(dtype=np.int64)
+        else:
+            volumes = _volumes(layers[i - 1].target, layers[i - 1].value)
+
+        mapping = {}
+        stage_members = {node: [node] for node in nodes}
+        if top and len(nodes) > top:
+            ranked = sorted(range(len(nodes)), key=lambda k: -int(volumes.get(nodes[k], 0)))
+            kept = set(ranked[:top])
+            folded = [node for k, node in enumerate(nodes) if k not in kept]
+            label = other_label(len(folded))
+            mapping = {node: label for node in folded}
+            stage_members = {node: [node] for k, node in enumerate(nodes) if k in kept}
+            stage_members[label] = folded
+        mappings.append(mapping)
+        members.append(stage_members)
+
+    layers = [
+        _merge_links(links, source_map, target_map, min_value or 0)
+        for links, source_map, target_map in zip(layers, mappings, mappings[1:])
+    ]
+
+    stages = [list(stage_members) for stage_members in members]
+    if min_value:
+        for i, stage_members in enumerate(members):
+            linked = set()
+            if i < len(layers):
+                linked.update(layers[i].source.tolist())
+            if i > 0:
+                linked.update(layers[i - 1].target.tolist())
+            stages[i] = [node for node in stage_members if node in linked]
+            members[i] = {node: stage_members[node] for node in stages[i]}
+
+    return stages, layers, members
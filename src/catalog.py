@@ -0,0 +1,498 @@
+# src/catalog.py
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # without pyarrow the catalog is always parsed from the CSV
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Column names used throughout the app, in the order they appear in reports.csv
+COLUMNS = ['data_source', 'report_name', 'stakeholder', 'program',
+           'delivery_schedule', 'report_owner', 'output_type', 'automation_level']
+
+# Columns kept as categoricals (everything except the free-text report name)
+CATEGORICAL_COLUMNS = ['data_source', 'stakeholder', 'program', 'delivery_schedule',
+                       'report_owner', 'output_type', 'automation_level']
+
+# Automation levels the roadmap projection can assign, even if absent from the file
+AUTOMATION_LEVELS = ['Fully', 'Manual', 'Semi', 'Tableau']
+
+# Catalog files read as Excel workbooks (see src/excel_source.py) rather than CSV
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def normalize_reports(report_df):
+    """Drop unnamed reports, rename columns and encode repeated values as categoricals"""
+    df = report_df[report_df['Report_Name'].notna()].iloc[:, :len(COLUMNS)]
+    df = df.set_axis(COLUMNS, axis=1).reset_index(drop=True)
+
+    df['report_name'] = df['report_name'].astype(object)
+    for col in CATEGORICAL_COLUMNS:
+        values = df[col].dropna().unique().tolist()
+        if col == 'automation_level':
+            values = set(values) | set(AUTOMATION_LEVELS)
+        df[col] = pd.Categorical(df[col], categories=sorted(values))
+
+    return df
+
+
+def file_signature(path):
+    """Cheap change probe: modification time and size of the file"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path):
+    """Content hash of the file, used to confirm a change seen by the stat probe"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temporary path next to path, renamed over it when the block
+    succeeds, so readers never see a partial file; removed otherwise
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_atomic(path, data):
+    """Write bytes to path through atomic_path()"""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+
+def default_cache_path(path):
+    """Location of the columnar cache for a catalog file (reports.csv -> reports.feather)"""
+    return os.path.splitext(path)[0] + '.feather'
+
+
+def read_cache(cache_path, digest):
+    """
+    Load the normalized catalog from its Arrow IPC (Feather) cache
+
+    Returns None if pyarrow is unavailable, the cache is missing, or it was
+    built from a different version of the source file.
+    """
+    if feather is None or not cache_path or not os.path.exists(cache_path):
+        return None
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning("Ignoring unreadable catalog cache %s: %s", cache_path, e)
+        return None
+    if (table.schema.metadata or {}).get(b'source_digest') != digest.encode():
+        return None
+    return table.to_pandas()
+
+
+def write_cache(df, cache_path, digest):
+    """Write the normalized catalog to cache_path, tagged with the source file digest"""
+    if feather is None or not cache_path:
+        return
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'source_digest': digest.encode()})
+
+    try:
+        with atomic_path(cache_path) as tmp_path:
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+    except OSError as e:
+        logger.warning("Could not write catalog cache %s: %s", cache_path, e)
+
+
+class CategoricalFrameBuilder:
+    """
+    Assemble the normalized catalog frame from row chunks
+
+    Each chunk is factorized and only its integer codes are kept, mapped onto
+    one growing dictionary per column, so memory stays proportional to the
+    codes plus the distinct values rather than one Python object per cell.
+    Rows must carry the values of COLUMNS, in that order.
+    """
+
+    def __init__(self):
+        self._lookups = {col: {} for col in CATEGORICAL_COLUMNS}
+        self._codes = {col: [] for col in CATEGORICAL_COLUMNS}
+        self._names = []
+
+    def append(self, rows):
+        if not rows:
+            return
+        columns = dict(zip(COLUMNS, (np.array(values, dtype=object) for values in zip(*rows))))
+
+        # Unnamed rows are not reports
+        named = pd.notna(columns['report_name'])
+        self._names.append(columns['report_name'][named])
+
+        for col in CATEGORICAL_COLUMNS:
+            local_codes, uniques = pd.factorize(columns[col][named])
+            lookup = self._lookups[col]
+            mapping = np.array([lookup.setdefault(value, len(lookup)) for value in uniques] + [-1], dtype=np.int32)
+            self._codes[col].append(mapping[local_codes])
+
+    def frame(self):
+        """The catalog frame built from every chunk appended so far"""
+        data = {'report_name': np.concatenate(self._names) if self._names else np.empty(0, dtype=object)}
+
+        for col in CATEGORICAL_COLUMNS:
+            values = list(self._lookups[col])
+            if col == 'automation_level':
+                values += [level for level in AUTOMATION_LEVELS if level not in self._lookups[col]]
+
+            # Re-number the codes so categories are sorted, as in normalize_reports()
+            order = sorted(range(len(values)), key=lambda i: values[i])
+            remap = np.empty(len(values) + 1, dtype=np.int32)
+            remap[order] = np.arange(len(values), dtype=np.int32)
+            remap[-1] = -1
+
+            codes = np.concatenate(self._codes[col]) if self._codes[col] else np.empty(0, dtype=np.int32)
+            data[col] = pd.Categorical.from_codes(remap[codes], categories=[values[i] for i in order])
+
+        return pd.DataFrame(data, columns=COLUMNS)
+
+
+def report_keys(df, numbered=False):
+    """
+    Index identifying each report across catalog versions
+
+    The key is the report name, plus its occurrence number if numbered (needed
+    when a name is listed more than once).
+    """
+    names = df['report_name']
+    if not numbered:
+        return pd.Index(names)
+    occurrence = names.groupby(names, sort=False, dropna=False).cumcount()
+    return pd.MultiIndex.from_arrays([names, occurrence])
+
+
+class CatalogDelta:
+    """
+    Row-level difference between two versions of the catalog
+
+    Rows are matched by report key (see report_keys). position_map[i] is the
+    new position of old row i, or -1 if it was removed; stable_map is the same
+    but also -1 for changed rows. added, changed and inserted (both together)
+    hold new positions. values maps each column to the values that gained or
+    lost a report; only those values' report lists differ. owners holds the
+    owner of every added, removed or changed report.
+    monotonic is False if unchanged rows were reordered.
+    """
+
+    def __init__(self, old, new):
+        numbered = not (old['report_name'].is_unique and new['report_name'].is_unique)
+        old_keys, new_keys = report_keys(old, numbered), report_keys(new, numbered)
+
+        self.position_map = new_keys.get_indexer(old_keys)
+        kept_old = np.flatnonzero(self.position_map >= 0)
+        kept_new = self.position_map[kept_old]
+
+        self.removed = np.flatnonzero(self.position_map < 0)
+        present = np.zeros(len(new), dtype=bool)
+        present[kept_new] = True
+        self.added = np.flatnonzero(~present)
+
+        differs = np.zeros(len(kept_old), dtype=bool)
+        self.values = {}
+        for col in COLUMNS:
+            before = old[col].to_numpy(dtype=object)
+            after = new[col].to_numpy(dtype=object)
+            a, b = before[kept_old], after[kept_new]
+            col_differs = (a != b) & ~(pd.isna(a) & pd.isna(b))
+            differs |= col_differs
+            touched = (set(before[self.removed]) | set(after[self.added]) |
+                       set(a[col_differs]) | set(b[col_differs]))
+            self.values[col] = {value for value in touched if not pd.isna(value)}
+
+        # Owners with an added, removed or changed report
+        owners_before = old['report_owner'].to_numpy(dtype=object)
+        owners_after = new['report_owner'].to_numpy(dtype=object)
+        self.owners = {owner for owner in (
+            set(owners_before[self.removed]) | set(owners_after[self.added]) |
+            set(owners_before[kept_old[differs]]) | set(owners_after[kept_new[differs]])
+        ) if not pd.isna(owner)}
+
+        self.changed = kept_new[differs]
+        self.inserted = np.sort(np.concatenate((self.added, self.changed)))
+        self.stable_map = self.position_map.copy()
+        self.stable_map[kept_old[differs]] = -1
+        self.monotonic = bool(np.all(np.diff(kept_new) > 0))
+
+        # Columns whose set of distinct values changed
+        self.distinct_changed = {
+            col for col in CATEGORICAL_COLUMNS
+            if set(old[col].dropna().unique()) != set(new[col].dropna().unique())
+        }
+
+    @property
+    def empty(self):
+        """True if both versions hold the same reports in the same order"""
+        return not (len(self.added) or len(self.removed) or len(self.changed)) and self.monotonic
+
+    def summary(self):
+        return {
+            "added": int(len(self.added)),
+            "removed": int(len(self.removed)),
+            "changed": int(len(self.changed)),
+            "reordered": not self.monotonic,
+            "owners": sorted(self.owners),
+        }
+
+
+# One entry of ReportCatalog.changes: the delta that turned previous_version into version
+CatalogChange = namedtuple('CatalogChange', ['previous_version', 'version', 'delta', 'changed_at'])
+
+
+class CsvSource:
+    """Catalog stored in a CSV file, with an optional columnar cache next to it"""
+
+    def __init__(self, path, cache_path=None):
+        self.path = path
+        self.cache_path = default_cache_path(path) if cache_path is None else cache_path
+
+    def signature(self):
+        return file_signature(self.path)
+
+    def digest(self, signature):
+        return file_digest(self.path)
+
+    def read(self, digest):
+        df = read_cache(self.cache_path, digest)
+        if df is None:
+            df = normalize_reports(pd.read_csv(self.path))
+            write_cache(df, self.cache_path, digest)
+        return df
+
+    def __str__(self):
+        return self.path
+
+
+def file_source(path, cache_path=None, sheet=None):
+    """Source for a catalog file: an ExcelSource for workbooks (reading sheet), else a CsvSource"""
+    if path.lower().endswith(EXCEL_EXTENSIONS):
+        from src.excel_source import ExcelSource  # imports this module
+        return ExcelSource(path, sheet=sheet, cache_path=cache_path)
+    return CsvSource(path, cache_path)
+
+
+class ReportCatalog:
+    """
+    Process-wide, in-memory copy of the report catalog
+
+    The source is read once and kept as a categorical DataFrame. Every access
+    runs the source's cheap change probe (file mtime/size, or a row-count /
+    last-update query for a database); only when that changes is the content
+    identified (file hash), and only when the identity changes is the source
+    re-read. The new frame and its version token are swapped in together, so
+    readers never see a half-loaded catalog.
+
+    source is a path to a CSV file or Excel workbook, or a source object
+    providing signature(), digest(signature) and read(digest) (see CsvSource,
+    src/excel_source.py and src/sql_source.py).
+    For a file, the normalized frame is also written to a columnar cache next
+    to the file (cache_path; pass '' to disable). Dictionary-encoded columns load
+    back as categoricals, so later cold starts skip CSV parsing until the file changes.
+
+    On a reload the new frame is diffed against the current one by report key
+    (track_changes). A reload that changes no report keeps the current frame
+    and version; otherwise the delta is recorded in changes and passed to the
+    on_change() listeners, and derived() structures that know how to apply it
+    are updated instead of rebuilt.
+
+    Callers must treat the returned frame as read-only.
+    """
+
+    def __init__(self, source, cache_path=None, check_interval=0, track_changes=True, history=32):
+        self.source = file_source(source, cache_path) if isinstance(source, str) else source
+        # Minimum number of seconds between change probes made by snapshot()
+        self.check_interval = check_interval
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._signature = None
+        self._digest = None
+        self._state = (None, None)  # (frame, version)
+        self._derived = {}
+        self._derived_locks = {}
+        self.reload_count = 0
+        # When False, the source is only re-checked by explicit refresh() calls
+        self.auto_refresh = True
+        self.track_changes = track_changes
+        # Recent CatalogChange entries, oldest first
+        self.changes = deque(maxlen=history)
+        self._listeners = []
+        # State pinned by pinned() for the current thread
+        self._local = threading.local()
+
+    def refresh(self):
+        """
+        Reload the catalog if the source changed; returns True on reload
+
+        If the source cannot be probed or read while a catalog is already
+        loaded, the error is logged and the last loaded version keeps being
+        served until a later check succeeds.
+        """
+        self._checked_at = time.monotonic()
+        try:
+            reloaded, change = self._reload()
+        except Exception:
+            if self._state[0] is None:
+                raise
+            logger.exception("Could not check catalog source %s; serving version %s", self.source, self._state[1])
+            return False
+
+        if change is not None:
+            for listener in self._listeners:
+                listener(change)
+        return reloaded
+
+    def _reload(self):
+        """Probe the source once and load it if it changed; returns (reloaded, CatalogChange or None)"""
+        signature = self.source.signature()
+        if signature == self._signature:
+            return False, None
+
+        with self._lock:
+            # Another thread may have loaded this signature while we waited for the lock
+            if signature == self._signature:
+                return False, None
+
+            digest = self.source.digest(signature)
+            if digest == self._digest:
+                self._signature = signature
+                return False, None
+
+            df = self.source.read(digest)
+            previous_df, previous_version = self._state
+            delta = None
+            if previous_df is not None and self.track_changes:
+                delta = CatalogDelta(previous_df, df)
+                if delta.empty:
+                    # Same reports (e.g. the file was re-saved): keep the current frame and version
+                    self._digest = digest
+                    self._signature = signature
+                    return False, None
+
+            self.reload_count += 1
+            self._state = (df, f"{digest[:12]}-{self.reload_count}")
+            self._digest = digest
+            self._signature = signature
+
+            change = None
+            if delta is not None:
+                change = CatalogChange(previous_version, self._state[1], delta, time.time())
+                self.changes.append(change)
+
+        return True, change
+
+    def on_change(self, listener):
+        """Call listener(change) with the CatalogChange of every later reload"""
+        self._listeners.append(listener)
+
+    def change_from(self, version):
+        """The recorded change from version to the current version, or None"""
+        current = self._state[1]
+        for change in reversed(self.changes):
+            if change.version == current:
+                return change if change.previous_version == version else None
+        return None
+
+    def snapshot(self):
+        """Return a consistent (frame, version) pair, reloading first if needed"""
+        pinned = getattr(self._local, 'state', None)
+        if pinned is not None:
+            return pinned
+        if self._state[0] is None:
+            self.refresh()
+        elif self.auto_refresh and time.monotonic() - self._checked_at >= self.check_interval:
+            self.refresh()
+        return self._state
+
+    @contextmanager
+    def pinned(self):
+        """
+        Serve one (frame, version) snapshot to this thread until the block ends,
+        yielding its version
+
+        Everything read from the catalog inside the block (frame, version and
+        derived structures) then comes from the same version, even if another
+        thread reloads the catalog meanwhile. Nested blocks share the outer snapshot.
+        """
+        if getattr(self._local, 'state', None) is not None:
+            yield self._local.state[1]
+            return
+        self._local.state = self.snapshot()
+        try:
+            yield self._local.state[1]
+        finally:
+            self._local.state = None
+
+    @property
+    def frame(self):
+        return self.snapshot()[0]
+
+    @property
+    def version(self):
+        """Opaque token that changes whenever the loaded catalog changes"""
+        return self.snapshot()[1]
+
+    def derived(self, name, build, update=None):
+        """
+        Return build(frame) for the current catalog version, computing it at most
+        once per version. Use this for indexes and other structures derived from
+        the catalog so they are rebuilt only when the file changes.
+
+        If update is given and the previous value was derived from the version
+        just before the current one, update(previous value, delta, frame) is
+        used instead of build.
+        """
+        df, version = self.snapshot()
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        if version != self._state[1]:
+            # Pinned to a version that has since been replaced: build it without caching
+            return build(df)
+
+        lock = self._derived_locks.setdefault(name, threading.Lock())
+        # Callers arriving while the value is being built wait for it instead of building it again
+        with lock:
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            change = self.change_from(cached[0]) if cached is not None and update is not None else None
+            value = update(cached[1], change.delta, df) if change is not None else build(df)
+            self._derived[name] = (version, value)
+        return value
+
+
+if __name__ == '__main__':
+    # Preprocessing step: python -m src.catalog [path/to/reports.csv or reports.xlsx]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'file/reports.csv'
+    report_catalog = ReportCatalog(source)
+    report_catalog.refresh()
+    print(f"Cached {len(report_catalog.frame)} reports from {source} in {report_catalog.source.cache_path}")
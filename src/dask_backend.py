@@ -0,0 +1,104 @@
+# src/dask_backend.py
+
+import os
+
+import numpy as np
+
+from src.links import STAGE_PAIRS, StageLinks, stage_links
+
+try:
+    import dask
+    import dask.dataframe as dd
+except ImportError:  # dask is optional; without it every aggregation runs in-process
+    dask = None
+    dd = None
+
+
+def _partition_links(part, offset, pairs):
+    """Aggregate the link layers of one partition, with row positions made global"""
+    layers = []
+    for source_col, target_col in pairs:
+        links = stage_links(part, source_col, target_col)
+        layers.append({
+            (source, target): (int(value), rows + offset)
+            for source, target, value, rows in zip(links.source, links.target, links.value, links.rows)
+        })
+    return layers
+
+
+def _merge_links(left, right):
+    """Combine the per-layer link tables of two consecutive runs of partitions"""
+    merged = []
+    for left_layer, right_layer in zip(left, right):
+        layer = dict(left_layer)
+        for key, (value, rows) in right_layer.items():
+            if key in layer:
+                # left covers earlier rows, so concatenating keeps frame order
+                layer[key] = (layer[key][0] + value, np.concatenate([layer[key][1], rows]))
+            else:
+                layer[key] = (value, rows)
+        merged.append(layer)
+    return merged
+
+
+def _merge_all(*partials):
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged = _merge_links(merged, partial)
+    return merged
+
+
+def _to_stage_links(layer):
+    keys = sorted(layer)
+    return StageLinks(
+        source=np.array([source for source, _ in keys], dtype=object),
+        target=np.array([target for _, target in keys], dtype=object),
+        value=np.array([layer[key][0] for key in keys], dtype=np.int64),
+        rows=[layer[key][1] for key in keys],
+    )
+
+
+def dask_stage_links(ddf, scheduler=None, split_every=8, pairs=STAGE_PAIRS):
+    """
+    Aggregate the link layers (one per stage pair in pairs, every layer by
+    default) of a partitioned catalog in parallel
+
+    ddf is a dask DataFrame with the stage columns and report_name (for example
+    dd.from_pandas of a large frame, or dd.read_parquet of the full inventory).
+    Each partition is aggregated independently with the same single-pass
+    grouping as all_stage_links(), then the per-partition tables are merged in a
+    tree of split_every-wide reductions, so only a few partitions' worth of
+    rows are in flight per worker. Returns the same StageLinks list as
+    stage_links() of each pair on ddf.compute(), with row positions counted
+    across partitions.
+    """
+    if dask is None:
+        raise RuntimeError("The dask backend requires the dask package")
+
+    scheduler = scheduler or os.environ.get('SANKEY_DASK_SCHEDULER', 'threads')
+
+    # Global row position of each partition's first row
+    lengths = ddf.map_partitions(len).compute(scheduler=scheduler)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    tasks = [
+        dask.delayed(_partition_links)(part, int(offset), pairs)
+        for part, offset in zip(ddf.to_delayed(), offsets)
+    ]
+    while len(tasks) > 1:
+        tasks = [
+            dask.delayed(_merge_all)(*tasks[i:i + split_every])
+            for i in range(0, len(tasks), split_every)
+        ]
+
+    (layers,) = dask.compute(tasks[0], scheduler=scheduler)
+    return [_to_stage_links(layer) for layer in layers]
+
+
+def partitioned_stage_links(df, npartitions=None, scheduler=None, pairs=STAGE_PAIRS):
+    """The link layers of pairs for an in-memory frame, computed across cores by dask"""
+    if dask is None:
+        raise RuntimeError("The dask backend requires the dask package")
+
+    npartitions = npartitions or os.cpu_count() or 1
+    return dask_stage_links(dd.from_pandas(df, npartitions=npartitions, sort=False), scheduler, pairs=pairs)
@@ -9,62 +9,68 @@ class AutomationTracker:
     def __init__(self, total_reports=100, total_months=24):
         self.total_reports = total_reports
         self.total_months = total_months
+        self._timeline = None
+
+    def timeline(self, months=None):
+        """
+        Report counts and month-over-month flows for months 0..months-1
+
+        Returns a dict of NumPy arrays indexed by month, computed in one
+        vectorized pass and cached on the tracker.
+        """
+        months = self.total_months if months is None else months
+        key = (self.total_reports, self.total_months)
+        if self._timeline is None or self._timeline[0] != key or len(self._timeline[1]['month']) < months:
+            self._timeline = (key, self._compute_timeline(max(months, self.total_months)))
+        return {name: values[:months] for name, values in self._timeline[1].items()}
+
+    def _compute_timeline(self, months):
+        month = np.arange(months)
+
+        # Retirement starts at month 3 and reaches 15% by month 19
+        retirement_per_month = (self.total_reports * 0.15) / 16  # Spread 15% over 16 months
+        retirement = np.where(
+            month < 3,
+            0,
+            np.minimum(int(self.total_reports * 0.15), ((month - 3) * retirement_per_month).astype(np.int64))
+        )
 
-    def calculate_flows(self, current_month):
-        # Calculate retirement target (starts at month 3, reaches 15% by month 19)
-        if current_month < 3:
-            retirement_target = 0
-        else:
-            months_since_start = current_month - 3
-            retirement_per_month = (self.total_reports * 0.15) / 16  # Spread 15% over 16 months
-            retirement_target = min(
-                int(self.total_reports * 0.15),  # Max 15%
-                int(months_since_start * retirement_per_month)
-            )
-
-        # Calculate remaining reports after retirement
-        remaining_reports = self.total_reports - retirement_target
-
-        # Ensure at least 25% stays manual
-        max_automation = int(remaining_reports * 0.75)
-
-        # Calculate automation targets
-        if current_month < 2:
-            # First 2 months: Planning phase
-            webui_target = 0
-            tableau_target = 0
-        else:
-            # Progressive automation, maintaining manual minimum
-            webui_target = min(
-                int(max_automation * 0.6),  # 60% of automatable goes to Web UI
-                int((current_month / self.total_months) * max_automation * 0.6)
-            )
-            tableau_target = min(
-                int(max_automation * 0.4),  # 40% of automatable goes to Tableau
-                int((current_month / self.total_months) * max_automation * 0.4)
-            )
-
-        manual = self.total_reports - webui_target - tableau_target - retirement_target
-
-        # Calculate flows from previous month
-        if current_month > 0:
-            prev_flows = self.calculate_flows(current_month - 1)
-            webui_flow = webui_target - prev_flows['webui']
-            tableau_flow = tableau_target - prev_flows['tableau']
-            retirement_flow = retirement_target - prev_flows['retired']
-        else:
-            webui_flow = 0
-            tableau_flow = 0
-            retirement_flow = 0
-
+        # Ensure at least 25% of the remaining reports stay manual
+        remaining = self.total_reports - retirement
+        max_automation = (remaining * 0.75).astype(np.int64)
+
+        # Progressive automation after the 2-month planning phase:
+        # 60% of automatable goes to Web UI, 40% to Tableau
+        progress = month / self.total_months
+        webui = np.where(month < 2, 0, np.minimum(
+            (max_automation * 0.6).astype(np.int64),
+            (progress * max_automation * 0.6).astype(np.int64)
+        ))
+        tableau = np.where(month < 2, 0, np.minimum(
+            (max_automation * 0.4).astype(np.int64),
+            (progress * max_automation * 0.4).astype(np.int64)
+        ))
+
+        manual = self.total_reports - webui - tableau - retirement
+
+        # Flows are the change from the previous month (none in month 0)
         return {
+            'month': month,
             'manual': manual,
-            'webui': webui_target,
-            'tableau': tableau_target,
-            'retired': retirement_target,
-            'manual_to_webui': webui_flow,
-            'manual_to_tableau': tableau_flow,
-            'manual_to_retired': retirement_flow
+            'webui': webui,
+            'tableau': tableau,
+            'retired': retirement,
+            'manual_to_webui': np.diff(webui, prepend=webui[:1]),
+            'manual_to_tableau': np.diff(tableau, prepend=tableau[:1]),
+            'manual_to_retired': np.diff(retirement, prepend=retirement[:1])
+        }
+
+    def calculate_flows(self, current_month):
+        timeline = self.timeline(current_month + 1)
+        return {
+            name: int(values[current_month])
+            for name, values in timeline.items()
+            if name != 'month'
         }
 
     def create_sankey(self, current_month):
@@ -135,15 +141,82 @@ class AutomationTracker:
 
         return fig
 
+# Figures are cached across Streamlit reruns, keyed on the tracker parameters and month
+@st.cache_data(max_entries=512)
+def sankey_figure(total_reports, total_months, month):
+    return AutomationTracker(total_reports, total_months).create_sankey(month)
+
+
+@st.cache_data(max_entries=512)
+def progress_figure(total_reports, total_months, month):
+    timeline = AutomationTracker(total_reports, total_months).timeline(month + 1)
+
+    progress_df = pd.DataFrame({
+        'Month': timeline['month'] + 1,
+        'Manual': timeline['manual'],
+        'Web UI': timeline['webui'],
+        'Tableau': timeline['tableau'],
+        'Retired': timeline['retired']
+    })
+
+    # Plot progress using Plotly
+    progress_fig = go.Figure()
+    progress_fig.add_trace(go.Scatter(
+        x=progress_df['Month'],
+        y=progress_df['Manual'],
+        name='Manual',
+        fill='tonexty',
+        mode='lines',
+        line=dict(color='#ef4444')
+    ))
+    progress_fig.add_trace(go.Scatter(
+        x=progress_df['Month'],
+        y=progress_df['Web UI'],
+        name='Web UI',
+        fill='tonexty',
+        mode='lines',
+        line=dict(color='#22c55e')
+    ))
+    progress_fig.add_trace(go.Scatter(
+        x=progress_df['Month'],
+        y=progress_df['Tableau'],
+        name='Tableau',
+        fill='tonexty',
+        mode='lines',
+        line=dict(color='#3b82f6')
+    ))
+    progress_fig.add_trace(go.Scatter(
+        x=progress_df['Month'],
+        y=progress_df['Retired'],
+        name='Retired',
+        fill='tonexty',
+        mode='lines',
+        line=dict(color='#6b7280')
+    ))
+
+    progress_fig.update_layout(
+        title='Progress Over Time',
+        xaxis_title='Month',
+        yaxis_title='Number of Reports',
+        height=400
+    )
+
+    return progress_fig
+
+
 def main():
     st.set_page_config(layout="wide")
     st.title('Report Automation Progress Tracker')
 
+    # Portfolio size and program length
+    total_reports = st.sidebar.number_input('Total Reports', min_value=1, value=100, step=100)
+    total_months = st.sidebar.number_input('Program Length (months)', min_value=4, value=24, step=12)
+
     # Create tracker instance
-    tracker = AutomationTracker()
+    tracker = AutomationTracker(total_reports, total_months)
 
     # Add month slider
-    month = st.slider('Select Month', min_value=0, max_value=23, value=0, format="Month %d")
+    month = st.slider('Select Month', min_value=0, max_value=total_months - 1, value=0, format="Month %d")
 
     # Create columns for metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -183,64 +256,9 @@ def main():
         )
 
     # Create and display Sankey diagram
-    fig = tracker.create_sankey(month)
+    fig = sankey_figure(total_reports, total_months, month)
     st.plotly_chart(fig, use_container_width=True)
 
     # Add progress chart
     st.subheader('Overall Progress')
-    progress_data = []
-    for m in range(month + 1):
-        flows = tracker.calculate_flows(m)
-        progress_data.append({
-            'Month': m + 1,
-            'Manual': flows['manual'],
-            'Web UI': flows['webui'],
-            'Tableau': flows['tableau'],
-            'Retired': flows['retired']
-        })
-
-    progress_df = pd.DataFrame(progress_data)
-
-    # Plot progress using Plotly
-    progress_fig = go.Figure()
-    progress_fig.add_trace(go.Scatter(
-        x=progress_df['Month'],
-        y=progress_df['Manual'],
-        name='Manual',
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='#ef4444')
-    ))
-    progress_fig.add_trace(go.Scatter(
-        x=progress_df['Month'],
-        y=progress_df['Web UI'],
-        name='Web UI',
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='#22c55e')
-    ))
-    progress_fig.add_trace(go.Scatter(
-        x=progress_df['Month'],
-        y=progress_df['Tableau'],
-        name='Tableau',
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='#3b82f6')
-    ))
-    progress_fig.add_trace(go.Scatter(
-        x=progress_df['Month'],
-        y=progress_df['Retired'],
-        name='Retired',
-        fill='tonexty',
-        mode='lines',
-        line=dict(color='#6b7280')
-    ))
-
-    progress_fig.update_layout(
-        title='Progress Over Time',
-        xaxis_title='Month',
-        yaxis_title='Number of Reports',
-        height=400
-    )
-
-    st.plotly_chart(progress_fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(progress_figure(total_reports, total_months, month), use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,69 @@
+# src/excel_source.py
+
+import hashlib
+from itertools import islice
+
+from src.catalog import COLUMNS, CategoricalFrameBuilder, default_cache_path, file_signature, read_cache, write_cache
+
+try:
+    import openpyxl
+except ImportError:  # .xlsx catalogs need openpyxl; CSV and database catalogs do not
+    openpyxl = None
+
+
+class ExcelSource:
+    """
+    Catalog stored in an Excel workbook, with an optional columnar cache next to it
+
+    The workbook is opened in openpyxl's read-only mode, which streams the
+    sheet's XML instead of building every cell: only the first len(COLUMNS)
+    columns of sheet (the active sheet by default) are read, below header_row,
+    in chunks of chunk_size rows. Other sheets are never parsed.
+
+    Workbooks are zip archives whose bytes change on every save, so the cache
+    is keyed on the file's modification time and size rather than a content
+    hash; a save that changes no report is still recognized by the catalog's
+    delta check.
+    """
+
+    def __init__(self, path, sheet=None, cache_path=None, header_row=1, chunk_size=10000):
+        self.path = path
+        self.sheet = sheet
+        self.cache_path = default_cache_path(path) if cache_path is None else cache_path
+        self.header_row = header_row
+        self.chunk_size = chunk_size
+
+    def signature(self):
+        return file_signature(self.path)
+
+    def digest(self, signature):
+        return hashlib.sha1(repr((self.sheet, signature)).encode()).hexdigest()
+
+    def read(self, digest):
+        df = read_cache(self.cache_path, digest)
+        if df is None:
+            df = self.parse()
+            write_cache(df, self.cache_path, digest)
+        return df
+
+    def parse(self):
+        if openpyxl is None:
+            raise RuntimeError(f"openpyxl is required to read {self.path}")
+
+        builder = CategoricalFrameBuilder()
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[self.sheet] if self.sheet else workbook.active
+            rows = sheet.iter_rows(min_row=self.header_row + 1, max_col=len(COLUMNS), values_only=True)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                builder.append(chunk)
+        finally:
+            # Read-only workbooks keep the file open until closed
+            workbook.close()
+        return builder.frame()
+
+    def __str__(self):
+        return self.path if not self.sheet else f"{self.path}[{self.sheet}]"
@@ -0,0 +1,55 @@
+# src/figure_json.py
+
+import json
+from functools import lru_cache
+
+import numpy as np
+import plotly.io as pio
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """
+    Encode obj as a JSON string, with orjson when it is installed
+
+    numpy arrays and scalars are encoded as lists and numbers, and non-string
+    dict keys are converted to strings, as json.dumps does.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_default, separators=(',', ':'))
+
+
+@lru_cache(maxsize=None)
+def _template_json(name):
+    return dumps(pio.templates[name].to_plotly_json())
+
+
+def figure_json(spec):
+    """
+    Encode a figure spec ({"data": [...], "layout": {...}} of plain dicts) like go.Figure(spec).to_json()
+
+    The spec is not validated: it must already be in the form Plotly would
+    produce. Unless the layout sets one, the default template is spliced in,
+    encoded once per process.
+    """
+    layout = spec['layout']
+    if 'template' in layout or pio.templates.default is None:
+        return dumps(spec)
+    template = '"template":' + _template_json(pio.templates.default)
+    layout = dumps(layout)
+    layout = '{' + template + ('}' if layout == '{}' else ',' + layout[1:])
+    return '{"data":' + dumps(spec['data']) + ',"layout":' + layout + '}'
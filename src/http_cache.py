@@ -0,0 +1,116 @@
+# src/http_cache.py
+
+import functools
+import gzip
+import hashlib
+import zlib
+
+from flask import current_app, request
+
+from src.response_cache import ResponseCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Response encodings we can produce, in order of preference
+ENCODINGS = (['br'] if brotli is not None else []) + ['gzip']
+
+# Compressed bodies, keyed by ETag, so repeated responses are not recompressed
+_compressed = ResponseCache(maxsize=512)
+
+
+def negotiate_encoding():
+    """Best response encoding accepted by the client, or None for identity"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def compress_stream(chunks, encoding):
+    """
+    Compress a stream of str chunks, flushing after each one so the client
+    can decode every chunk as soon as it arrives
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor()
+        for chunk in chunks:
+            yield compressor.process(chunk.encode()) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        for chunk in chunks:
+            yield compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def streamed_response(chunks, mimetype):
+    """Streamed response of str chunks, compressed chunk by chunk with the best encoding the client accepts"""
+    encoding = negotiate_encoding()
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+    response = current_app.response_class(chunks, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = 'no-store'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def request_etag(version, encoding):
+    """Strong ETag for the current request: catalog version, path, arguments and encoding"""
+    digest = hashlib.sha1()
+    digest.update(str(version).encode())
+    digest.update(request.path.encode())
+    for key, value in sorted(request.args.items(multi=True)):
+        digest.update(f"\0{key}={value}".encode())
+    etag = digest.hexdigest()[:32]
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def conditional_json(pin):
+    """
+    Decorate a JSON view with ETag validation and response compression
+
+    pin() is a context manager yielding the catalog version, within which
+    the catalog serves that version only (ReportCatalog.pinned), so the view
+    builds its body from the version the ETag names. The ETag is computed
+    before the view runs, from that version and the request, so a matching
+    If-None-Match is answered with a 304 without doing any work. Otherwise the
+    body is compressed with the best encoding the client accepts. Clients
+    must revalidate on every use.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with pin() as version:
+                encoding = negotiate_encoding()
+                etag = request_etag(version, encoding)
+
+                if request.if_none_match.contains(etag):
+                    response = current_app.response_class(status=304)
+                else:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+
+                    if encoding:
+                        body = _compressed.get_or_build(
+                            version, etag, lambda: compress(response.get_data(), encoding)
+                        )
+                        response.set_data(body)
+                        response.headers['Content-Encoding'] = encoding
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Accept-Encoding')
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,272 @@
+# src/link_cube.py
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from src.links import STAGE_COLUMNS, STAGE_PAIRS, StageLinks
+
+
+def _narrowest_uint(max_value):
+    for dtype in (np.uint16, np.uint32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+class _LinkTable:
+    """
+    Sparse (group, source, target) -> count table with compressed row lists
+
+    Only non-empty links are stored, sorted by group, then source and target
+    code, as parallel arrays. The row ids of all links are concatenated in one
+    array (CSR layout, narrowest integer type) with per-link offsets, and each
+    group's links are one contiguous slice.
+    """
+
+    def __init__(self, group_codes, n_groups, source_codes, target_codes, row_ids):
+        n_sources = int(source_codes.max()) + 1 if len(source_codes) else 1
+        n_targets = int(target_codes.max()) + 1 if len(target_codes) else 1
+
+        valid = np.flatnonzero((group_codes >= 0) & (source_codes >= 0) & (target_codes >= 0))
+        keys = (group_codes[valid].astype(np.int64) * n_sources + source_codes[valid]) * n_targets + target_codes[valid]
+        order = np.argsort(keys, kind='stable')
+        self._fill(keys[order], row_ids[valid[order]], n_groups, n_sources, n_targets)
+
+    def _fill(self, keys, ids, n_groups, n_sources, n_targets):
+        """Set the arrays from the sorted link key and row id of every stored row"""
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        link_keys = keys[starts]
+        self.source = ((link_keys // n_targets) % n_sources).astype(np.int32)
+        self.target = (link_keys % n_targets).astype(np.int32)
+        self.count = np.diff(np.append(starts, len(keys))).astype(np.int32)
+        self.offsets = np.append(starts, len(keys)).astype(np.int64)
+        self.rows = ids.astype(_narrowest_uint(int(ids.max()) if len(ids) else 0))
+
+        link_groups = link_keys // (n_sources * n_targets)
+        self.group_starts = np.searchsorted(link_groups, np.arange(n_groups + 1))
+
+    def entries(self):
+        """(group, source, target, row id) of every stored row, in table order"""
+        groups = np.repeat(np.arange(len(self.group_starts) - 1), np.diff(self.group_starts))
+        links = np.repeat(np.arange(len(self.count)), self.count)
+        return groups[links], self.source[links], self.target[links], self.rows.astype(np.int64)
+
+    @classmethod
+    def merged(cls, kept, added, n_groups, n_sources, n_targets):
+        """
+        Table of kept and added (group, source, target, row id) entries
+
+        kept must still be in table order (e.g. entries() with codes and row
+        ids remapped by increasing maps). Only the added entries are sorted;
+        they are merged into the kept ones by binary search.
+        """
+        def link_keys(groups, sources, targets):
+            return (groups.astype(np.int64) * n_sources + sources) * n_targets + targets
+
+        kept_keys, kept_rows = link_keys(*kept[:3]), kept[3]
+        groups, sources, targets, rows = added
+        valid = (groups >= 0) & (sources >= 0) & (targets >= 0)
+        added_keys, added_rows = link_keys(groups[valid], sources[valid], targets[valid]), rows[valid]
+
+        n_ids = int(max(kept_rows.max(initial=0), added_rows.max(initial=0))) + 1
+        if n_groups * n_sources * n_targets * n_ids < 1 << 63:
+            order = np.argsort(added_keys * n_ids + added_rows)
+            added_keys, added_rows = added_keys[order], added_rows[order]
+            positions = np.searchsorted(kept_keys * n_ids + kept_rows, added_keys * n_ids + added_rows)
+            keys = np.insert(kept_keys, positions, added_keys)
+            ids = np.insert(kept_rows, positions, added_rows)
+        else:
+            keys = np.concatenate((kept_keys, added_keys))
+            ids = np.concatenate((kept_rows, added_rows))
+            order = np.lexsort((ids, keys))
+            keys, ids = keys[order], ids[order]
+
+        table = cls.__new__(cls)
+        table._fill(keys, ids, n_groups, n_sources, n_targets)
+        return table
+
+    def links(self, group, source_labels, target_labels):
+        first, last = self.group_starts[group], self.group_starts[group + 1]
+        offsets = self.offsets[first:last + 1]
+        rows = self.rows[offsets[0]:offsets[-1]]
+        return StageLinks(
+            source=source_labels[self.source[first:last]],
+            target=target_labels[self.target[first:last]],
+            value=self.count[first:last].astype(np.int64),
+            rows=np.split(rows, offsets[1:-1] - offsets[0]) if last > first else [],
+        )
+
+
+class LinkCube:
+    """
+    Materialized link counts and report rows for every owner and stage pair
+
+    Built once per catalog version, it answers the link layers and node lists
+    of any owner view (or the "All Owners" view) with array slices instead of
+    filtering and re-grouping the catalog. Owner views return row positions
+    within that owner's reports (i.e. into catalog[catalog.report_owner == owner]),
+    the all-owners view returns catalog row positions, matching what
+    all_stage_links() gives for the corresponding frame.
+    """
+
+    def __init__(self, df):
+        self.frame = df
+        n_rows = len(df)
+
+        owner_codes, owners = pd.factorize(df['report_owner'], sort=True)
+        self._owners = {owner: code for code, owner in enumerate(owners.tolist())}
+
+        # Position of each row among its owner's rows, in frame order
+        order = np.argsort(owner_codes, kind='stable')
+        missing = int((owner_codes < 0).sum())
+        owner_counts = np.bincount(owner_codes[owner_codes >= 0], minlength=len(owners))
+        owner_starts = np.concatenate(([0], np.cumsum(owner_counts)))
+        owned = order[missing:]
+        local_rows = np.full(n_rows, -1, dtype=np.int64)
+        local_rows[owned] = np.arange(len(owned)) - owner_starts[owner_codes[owned]]
+
+        self._labels = {}
+        codes = {}
+        for col in STAGE_COLUMNS:
+            codes[col], labels = pd.factorize(df[col], sort=True)
+            self._labels[col] = np.asarray(labels, dtype=object)
+
+        everyone = np.zeros(n_rows, dtype=np.int64)
+        all_rows = np.arange(n_rows)
+        self._owner_tables = {}
+        self._all_tables = {}
+        for source_col, target_col in STAGE_PAIRS:
+            self._owner_tables[(source_col, target_col)] = _LinkTable(
+                owner_codes, len(owners), codes[source_col], codes[target_col], local_rows)
+            self._all_tables[(source_col, target_col)] = _LinkTable(
+                everyone, 1, codes[source_col], codes[target_col], all_rows)
+
+        # Distinct values of each stage column per owner, as sorted (owner, value) code pairs
+        self._owner_nodes = {}
+        for col in STAGE_COLUMNS:
+            n_values = max(len(self._labels[col]), 1)
+            valid = (owner_codes >= 0) & (codes[col] >= 0)
+            pairs = np.unique(owner_codes[valid].astype(np.int64) * n_values + codes[col][valid])
+            starts = np.searchsorted(pairs // n_values, np.arange(len(owners) + 1))
+            self._owner_nodes[col] = ((pairs % n_values).astype(np.int32), starts)
+
+    def updated(self, delta, df):
+        """
+        Cube of df, the catalog after delta (a CatalogDelta), derived from this one
+
+        Owners with no added, removed or changed report keep their link and
+        node segments, with value codes moved to the new labels; only the rows
+        of the other owners are coded and merged in. The all-owners view keeps
+        its unchanged rows at their new positions and merges in the added and
+        changed ones. The result is identical to LinkCube(df). A reordered
+        catalog is built from scratch.
+        """
+        if not delta.monotonic:
+            return LinkCube(df)
+
+        # Labels only change with the set of distinct values, and then old codes
+        # must map to new ones in the same order for kept segments to stay sorted
+        labels, code_maps = {}, {}
+        for col in STAGE_COLUMNS:
+            labels[col] = self._labels[col]
+            code_maps[col] = np.arange(len(labels[col]))
+            if col in delta.distinct_changed:
+                labels[col] = np.asarray(pd.factorize(df[col], sort=True)[1], dtype=object)
+                code_maps[col] = pd.Index(labels[col]).get_indexer(self._labels[col])
+                present = code_maps[col][code_maps[col] >= 0]
+                if np.any(np.diff(present) <= 0):
+                    return LinkCube(df)
+
+        cube = copy.copy(self)
+        cube.frame = df
+        cube._labels = labels
+        owners = labels['report_owner']
+        cube._owners = {owner: code for code, owner in enumerate(owners.tolist())}
+        owner_map = code_maps['report_owner']
+
+        stale = np.zeros(len(self._owners) + 1, dtype=bool)
+        stale[[self._owners[owner] for owner in delta.owners if owner in self._owners]] = True
+
+        def coded(rows):
+            return {col: pd.Index(labels[col]).get_indexer(df[col].iloc[rows]) for col in STAGE_COLUMNS}
+
+        # Rows of the changed owners, with their position among their owner's rows
+        rows = np.flatnonzero(df['report_owner'].isin(delta.owners).to_numpy())
+        codes = coded(rows)
+        owner_codes = codes['report_owner']
+        order = np.argsort(owner_codes, kind='stable')
+        counts = np.bincount(owner_codes, minlength=len(owners))
+        local_rows = np.empty(len(rows), dtype=np.int64)
+        local_rows[order] = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        inserted = delta.inserted
+        inserted_codes = coded(inserted)
+
+        cube._owner_tables = {}
+        cube._all_tables = {}
+        for source_col, target_col in STAGE_PAIRS:
+            pair = (source_col, target_col)
+            source_map, target_map = code_maps[source_col], code_maps[target_col]
+            n_sources, n_targets = max(len(labels[source_col]), 1), max(len(labels[target_col]), 1)
+
+            groups, sources, targets, ids = self._owner_tables[pair].entries()
+            keep = ~stale[groups]
+            kept = (owner_map[groups[keep]], source_map[sources[keep]], target_map[targets[keep]], ids[keep])
+            added = (owner_codes, codes[source_col], codes[target_col], local_rows)
+            cube._owner_tables[pair] = _LinkTable.merged(kept, added, len(owners), n_sources, n_targets)
+
+            groups, sources, targets, ids = self._all_tables[pair].entries()
+            ids = delta.stable_map[ids]
+            keep = ids >= 0
+            kept = (groups[keep], source_map[sources[keep]], target_map[targets[keep]], ids[keep])
+            added = (np.zeros(len(inserted), dtype=np.int64), inserted_codes[source_col],
+                     inserted_codes[target_col], inserted)
+            cube._all_tables[pair] = _LinkTable.merged(kept, added, 1, n_sources, n_targets)
+
+        cube._owner_nodes = {}
+        for col in STAGE_COLUMNS:
+            values, starts = self._owner_nodes[col]
+            n_values = max(len(labels[col]), 1)
+            owner_of = np.repeat(np.arange(len(starts) - 1), np.diff(starts))
+            keep = ~stale[owner_of]
+            kept = owner_map[owner_of[keep]].astype(np.int64) * n_values + code_maps[col][values[keep]]
+            valid = (owner_codes >= 0) & (codes[col] >= 0)
+            added = np.unique(owner_codes[valid].astype(np.int64) * n_values + codes[col][valid])
+            pairs = np.insert(kept, np.searchsorted(kept, added), added)
+            starts = np.searchsorted(pairs // n_values, np.arange(len(owners) + 1))
+            cube._owner_nodes[col] = ((pairs % n_values).astype(np.int32), starts)
+        return cube
+
+    def _owner_code(self, owner):
+        """Owner code, None for the all-owners view, or -1 for an unknown owner"""
+        if not owner or owner == "All Owners":
+            return None
+        return self._owners.get(owner, -1)
+
+    def links(self, owner, source_col, target_col):
+        """StageLinks of one stage pair for an owner (or all owners)"""
+        code = self._owner_code(owner)
+        if code is None:
+            return self._all_tables[(source_col, target_col)].links(
+                0, self._labels[source_col], self._labels[target_col])
+        if code < 0:
+            empty = np.empty(0, dtype=object)
+            return StageLinks(source=empty, target=empty, value=np.empty(0, dtype=np.int64), rows=[])
+        return self._owner_tables[(source_col, target_col)].links(
+            code, self._labels[source_col], self._labels[target_col])
+
+    def nodes(self, owner, col):
+        """Sorted distinct values of a stage column for an owner (or all owners)"""
+        code = self._owner_code(owner)
+        if code is None:
+            return self._labels[col].tolist()
+        if code < 0:
+            return []
+        values, starts = self._owner_nodes[col]
+        return self._labels[col][values[starts[code]:starts[code + 1]]].tolist()
+
+    def stage_counts(self, owner):
+        """{(source_col, target_col): StageLinks} for every stage pair of an owner view"""
+        return {pair: self.links(owner, *pair) for pair in STAGE_PAIRS}
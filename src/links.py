@@ -0,0 +1,57 @@
+# src/links.py
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Sankey stages, left to right
+STAGE_COLUMNS = ['data_source', 'report_owner', 'stakeholder', 'output_type',
+                 'automation_level', 'delivery_schedule']
+
+# Each link layer connects one stage to the next
+STAGE_PAIRS = list(zip(STAGE_COLUMNS[:-1], STAGE_COLUMNS[1:]))
+
+# One link layer: parallel arrays of source label, target label, report count,
+# and the row positions (into the aggregated frame) of the reports on each link
+StageLinks = namedtuple('StageLinks', ['source', 'target', 'value', 'rows'])
+
+
+def stage_links(df, source_col, target_col):
+    """
+    Aggregate the links between two stage columns in a single grouped pass
+
+    Links come out in the same order as df.groupby([source_col, target_col]),
+    and each link's row positions keep the frame's row order.
+    """
+    source_codes, source_values = pd.factorize(df[source_col], sort=True)
+    target_codes, target_values = pd.factorize(df[target_col], sort=True)
+    source_values = np.asarray(source_values, dtype=object)
+    target_values = np.asarray(target_values, dtype=object)
+
+    # Rows with a missing value on either side are not part of any link
+    positions = np.flatnonzero((source_codes >= 0) & (target_codes >= 0))
+    pair_codes = source_codes[positions].astype(np.int64) * len(target_values) + target_codes[positions]
+
+    order = np.argsort(pair_codes, kind='stable')
+    pair_codes = pair_codes[order]
+    positions = positions[order]
+
+    link_codes, starts, counts = np.unique(pair_codes, return_index=True, return_counts=True)
+
+    return StageLinks(
+        source=source_values[link_codes // len(target_values)],
+        target=target_values[link_codes % len(target_values)],
+        value=counts,
+        rows=np.split(positions, starts[1:]) if len(starts) else [],
+    )
+
+
+def all_stage_links(df):
+    """Aggregate every link layer of the Sankey diagram"""
+    return [stage_links(df, source_col, target_col) for source_col, target_col in STAGE_PAIRS]
+
+
+def stage_nodes(df, col):
+    """Sorted distinct values of a stage column; missing values are not nodes, as in stage_links()"""
+    return sorted(set(df[col].dropna().unique()))
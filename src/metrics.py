@@ -0,0 +1,254 @@
+# src/metrics.py
+
+import bisect
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+
+# Histogram buckets: seconds for timings, bytes for payload sizes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+INF_BUCKET = 'le="+Inf"'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    """Prometheus-style histogram with fixed buckets, one series per label combination"""
+
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series = {}  # label values -> [bucket counts, sum, count]
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for label_values, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _labels(self.label_names, label_values, f'le="{bound:g}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, label_values, INF_BUCKET)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, label_values)} {total:g}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, label_values)} {count}")
+        return lines
+
+
+class Metrics:
+    """
+    Registry of histograms and of gauges/counters read from callbacks at scrape time
+
+    render() returns every metric in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._histograms = []
+        self._callbacks = []
+
+    def histogram(self, name, help_text, buckets, label_names=()):
+        histogram = Histogram(name, help_text, buckets, label_names)
+        self._histograms.append(histogram)
+        return histogram
+
+    def callback(self, name, help_text, metric_type, read, label_names=()):
+        """
+        Register a gauge or counter whose value is read(): a number, or a
+        {label values tuple: number} dict when label_names are given
+        """
+        self._callbacks.append((name, help_text, metric_type, read, tuple(label_names)))
+
+    def render(self):
+        lines = []
+        for histogram in self._histograms:
+            lines.extend(histogram.render())
+        for name, help_text, metric_type, read, label_names in self._callbacks:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            values = read()
+            if not label_names:
+                values = {(): values}
+            for label_values, value in values.items():
+                lines.append(f"{name}{_labels(label_names, label_values)} {value:g}")
+        return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of one thread at a fixed interval
+
+    Samples are counted as collapsed stacks ("outer;inner;leaf count" lines),
+    the input format of flamegraph tools.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def collapsed(self):
+        return '\n'.join(f"{stack} {count}" for stack, count in self.samples.most_common()) + '\n'
+
+
+# Process-wide registry, and the histograms every request records into
+metrics = Metrics()
+stage_seconds = metrics.histogram('rpt_sankey_stage_seconds', "Time spent in each stage of building a response",
+                                  LATENCY_BUCKETS, ['stage'])
+request_seconds = metrics.histogram('rpt_sankey_request_seconds', "Request latency by endpoint and status",
+                                    LATENCY_BUCKETS, ['endpoint', 'status'])
+response_bytes = metrics.histogram('rpt_sankey_response_bytes', "Response body size (after compression) by endpoint",
+                                   SIZE_BUCKETS, ['endpoint'])
+
+
+def record_stage(stage, elapsed):
+    """Record a stage duration in the stage histogram and the current request's Server-Timing header"""
+    stage_seconds.observe(elapsed, stage)
+    if has_request_context() and 'timings' in g:
+        g.timings.append((stage, elapsed))
+
+
+@contextmanager
+def timed(stage):
+    """Time a block as one stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+class StageTimer:
+    """Time consecutive stages of a function: lap(stage) records the time since the previous lap"""
+
+    def __init__(self):
+        self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        record_stage(stage, now - self._last)
+        self._last = now
+
+
+def server_timing(timings, total, total_name='total'):
+    """Server-Timing header value: each stage's total duration, in first-seen order, then the total"""
+    durations = {}
+    for stage, elapsed in timings:
+        durations[stage] = durations.get(stage, 0.0) + elapsed
+    entries = [f"{stage};dur={elapsed * 1000:.2f}" for stage, elapsed in durations.items()]
+    entries.append(f"{total_name};dur={total * 1000:.2f}")
+    return ', '.join(entries)
+
+
+def _measured_stream(chunks, started, endpoint, status):
+    """Pass a streamed body through, recording its latency and size once it ends or is closed"""
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk) if isinstance(chunk, bytes) else len(chunk.encode())
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+        request_seconds.observe(time.perf_counter() - started, endpoint, status)
+        response_bytes.observe(size, endpoint)
+
+
+def instrument(app, profiling=False):
+    """
+    Time every request of app, add Server-Timing headers and record request metrics
+
+    A streamed response sends its headers before its body is produced, so its
+    Server-Timing header gives the time to the headers ("headers" instead of
+    "total"), and its latency and size are recorded when the stream ends.
+    With profiling enabled, a request with profile=1 is sampled while it runs
+    and answered with its collapsed stacks instead of the normal response.
+    """
+    @app.before_request
+    def start_timing():
+        g.timings = []
+        g.request_started = time.perf_counter()
+        if profiling and request.args.get('profile'):
+            g.profiler = SamplingProfiler(threading.get_ident()).start()
+
+    @app.after_request
+    def finish_timing(response):
+        if 'request_started' not in g:
+            return response
+        total = time.perf_counter() - g.request_started
+        endpoint = request.endpoint or 'unknown'
+        if response.is_streamed and not response.direct_passthrough:
+            # Generated body (files sent as is are timed like any other response)
+            response.response = _measured_stream(response.response, g.request_started, endpoint,
+                                                 str(response.status_code))
+            response.headers['Server-Timing'] = server_timing(g.timings, total, 'headers')
+        else:
+            request_seconds.observe(total, endpoint, str(response.status_code))
+            response_bytes.observe(response.calculate_content_length() or 0, endpoint)
+            response.headers['Server-Timing'] = server_timing(g.timings, total)
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            response = app.response_class(profiler.collapsed(), mimetype='text/plain')
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # A failed request skips after_request; do not leave its sampler running
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+
+    return app
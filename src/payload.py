@@ -0,0 +1,103 @@
+# src/payload.py
+
+import numpy as np
+
+
+def compact_report_lists(names, *row_lists):
+    """
+    Replace lists of catalog row positions by delta-encoded ids (the first id
+    followed by successive gaps) into one shared dictionary of report names
+
+    names holds the report name of every catalog row; each row_lists argument
+    maps a key to ascending row positions. Returns the dictionary followed by one
+    {key: encoded ids} mapping per argument. The dictionary keeps catalog order,
+    so ids stay ascending and their gaps stay small.
+    """
+    arrays = [np.asarray(rows, dtype=np.int64) for lists in row_lists for rows in lists.values()]
+    flat = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+    referenced = np.unique(flat)
+
+    # Encode every list in one pass: gaps within the concatenation, with the
+    # first id of each list kept as is, then cut back into lists
+    ids = np.searchsorted(referenced, flat)
+    bounds = np.cumsum([0] + [len(rows) for rows in arrays])
+    gaps = np.diff(ids, prepend=0)
+    starts = bounds[:-1][np.diff(bounds) > 0]
+    gaps[starts] = ids[starts]
+    gaps = gaps.tolist()
+    bounds = bounds.tolist()
+
+    encoded = []
+    position = 0
+    for lists in row_lists:
+        encoded.append({
+            key: gaps[bounds[position + i]:bounds[position + i + 1]]
+            for i, key in enumerate(lists)
+        })
+        position += len(lists)
+    return (names[referenced].tolist(), *encoded)
+
+
+def name_ranks(names):
+    """Rank of every catalog row when ordered by report name (ties in catalog order)"""
+    order = np.argsort(np.asarray(names, dtype=object), kind='stable')
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def updated_name_ranks(ranks, delta, names):
+    """
+    name_ranks(names) of the catalog after delta (a CatalogDelta), derived from
+    the ranks before it
+
+    Unchanged rows keep their relative order; only the added and changed rows
+    are sorted and merged in by binary search. A reordered catalog is ranked
+    from scratch.
+    """
+    if not delta.monotonic:
+        return name_ranks(names)
+    names = np.asarray(names, dtype=object)
+    order = np.empty(len(ranks), dtype=np.int64)
+    order[ranks] = np.arange(len(ranks))
+    kept = delta.stable_map[order]
+    kept = kept[kept >= 0]
+
+    inserted = delta.inserted[np.argsort(names[delta.inserted], kind='stable')]
+    kept_names = names[kept]
+    positions = np.searchsorted(kept_names, names[inserted], side='left')
+    ends = np.searchsorted(kept_names, names[inserted], side='right')
+    # Among equal names, catalog order decides
+    for i in np.flatnonzero(ends > positions).tolist():
+        positions[i] += np.searchsorted(kept[positions[i]:ends[i]], inserted[i])
+    order = np.insert(kept, positions, inserted)
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    return ranks
+
+
+def page_rows(rows, sort_keys, cursor=None, limit=100):
+    """
+    One page of rows in ascending sort_keys[row] order, for cursor pagination
+
+    sort_keys must give every row a distinct key (negate it for a descending
+    order). cursor is the key of the last row of the previous page, or None for
+    the first page. Only the page itself is sorted, so each page costs a linear
+    pass over rows rather than a full sort. Returns (page rows, next cursor),
+    with a next cursor of None on the last page.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    keys = sort_keys[rows]
+    if cursor is not None:
+        after = keys > cursor
+        rows, keys = rows[after], keys[after]
+
+    more = len(rows) > limit
+    if more:
+        first = np.argpartition(keys, limit - 1)[:limit]
+        rows, keys = rows[first], keys[first]
+
+    order = np.argsort(keys, kind='stable')
+    rows, keys = rows[order], keys[order]
+    return rows, (int(keys[-1]) if more else None)
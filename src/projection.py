@@ -0,0 +1,93 @@
+# src/projection.py
+
+import numpy as np
+import pandas as pd
+
+
+class Roadmap:
+    """
+    Automation roadmap used to project the catalog into future quarters
+
+    Starting at (start_quarter, start_year), a growing share of the
+    source_level reports is converted each quarter, reaching target_pct
+    after total_quarters. Converted reports are split between the target
+    levels according to split. The seed makes the choice of reports
+    reproducible: the same catalog and roadmap always give the same projection.
+    """
+
+    def __init__(self, start_year=2025, start_quarter=1, total_quarters=6, target_pct=0.8,
+                 pace=6 / 5, split=(('Fully', 0.65), ('Tableau', 0.35)), source_level='Semi', seed=0):
+        self.start_year = start_year
+        self.start_quarter = start_quarter
+        self.total_quarters = total_quarters
+        self.target_pct = target_pct
+        # Scales the linear schedule (the original roadmap overshoots by 6/5 to land its target)
+        self.pace = pace
+        self.split = tuple(split)
+        self.source_level = source_level
+        self.seed = seed
+
+    def quarter_number(self, quarter, year):
+        """Quarters since the roadmap started (first roadmap quarter = 1, before it = 0)"""
+        number = (int(year) - self.start_year) * 4 + int(quarter) - self.start_quarter + 1
+        return max(0, number)
+
+    def quarters(self):
+        """(quarter, year) of every roadmap quarter, in order"""
+        result = []
+        for number in range(self.total_quarters):
+            offset = self.start_quarter - 1 + number
+            result.append((offset % 4 + 1, self.start_year + offset // 4))
+        return result
+
+    def converted_counts(self, total):
+        """Number of source reports converted by each quarter number 0..total_quarters"""
+        numbers = np.arange(self.total_quarters + 1)
+        fraction = np.minimum(self.target_pct, numbers / self.total_quarters * self.target_pct)
+        return np.minimum((total * (fraction * self.pace)).astype(np.int64), total)
+
+    def _hash(self, names, salt):
+        hash_key = f"{(self.seed * 2 + salt) & 0xFFFFFFFFFFFFFFFF:016x}"
+        return pd.util.hash_array(np.asarray(names, dtype=object), hash_key=hash_key)
+
+
+class Projection:
+    """
+    Whole roadmap timeline for one report frame
+
+    For every row it stores the quarter number in which the report converts
+    (never, for reports outside the source level or beyond the target) and
+    the level it converts to, so any quarter is one vectorized select.
+    """
+
+    def __init__(self, df, roadmap):
+        self.roadmap = roadmap
+        self.levels = df['automation_level']
+        names = df['report_name'].to_numpy()
+
+        source_rows = np.flatnonzero((self.levels == roadmap.source_level).to_numpy())
+
+        # Rank the source reports by a seeded hash of their name
+        priority = roadmap._hash(names[source_rows], salt=0)
+        ranked_rows = source_rows[np.argsort(priority, kind='stable')]
+
+        # Each rank converts in the first quarter whose cumulative count exceeds it
+        counts = roadmap.converted_counts(len(source_rows))
+        never = roadmap.total_quarters + 1
+        self.convert_at = np.full(len(df), never, dtype=np.int64)
+        self.convert_at[ranked_rows] = np.searchsorted(counts, np.arange(len(ranked_rows)), side='right')
+
+        # Split converted reports between target levels by a second, independent hash
+        share = roadmap._hash(names, salt=1) / float(2 ** 64)
+        boundaries = np.cumsum([ratio for _, ratio in roadmap.split])
+        boundaries[-1] = 1.0
+        targets = np.array([level for level, _ in roadmap.split], dtype=object)
+        self.targets = targets[np.minimum(np.searchsorted(boundaries, share, side='right'), len(targets) - 1)]
+
+    def levels_at(self, number):
+        """Projected automation_level column after the given quarter number"""
+        number = min(number, self.roadmap.total_quarters)
+        return self.levels.where(self.convert_at > number, self.targets)
+
+
+DEFAULT_ROADMAP = Roadmap()
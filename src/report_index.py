@@ -0,0 +1,119 @@
+# src/report_index.py
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+from src.catalog import COLUMNS
+
+
+class ReportIndex:
+    """
+    Inverted index of a report frame: column -> value -> row positions
+
+    Each column is stored compactly: row positions sorted by value (keeping
+    frame order within a value) plus the offsets where each value starts, so
+    a lookup is a dict probe and an array slice.
+    """
+
+    def __init__(self, df, columns=None):
+        self.frame = df
+        self.names = df['report_name'].to_numpy()
+        self._columns = {}
+
+        for col in columns or COLUMNS:
+            codes, uniques = pd.factorize(df[col])
+            missing = int((codes < 0).sum())
+            order = np.argsort(codes, kind='stable')[missing:].astype(np.int32)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            offsets = np.concatenate(([0], np.cumsum(counts)))
+            lookup = {value: code for code, value in enumerate(uniques.tolist())}
+            self._columns[col] = (lookup, order, offsets)
+
+    def updated(self, delta, df):
+        """
+        Index of df, the catalog after delta (a CatalogDelta), derived from this one
+
+        Unchanged rows keep their place in each column, moved to their new
+        positions; only added and changed rows are looked up and merged in, so
+        unchanged values are not hashed again. The result is identical to
+        ReportIndex(df). A reordered catalog is indexed from scratch.
+        """
+        if not delta.monotonic:
+            return ReportIndex(df, columns=list(self._columns))
+
+        index = copy.copy(self)
+        index.frame = df
+        index.names = df['report_name'].to_numpy()
+        index._columns = {col: self._merge(col, delta, df) for col in self._columns}
+        return index
+
+    def _merge(self, col, delta, df):
+        lookup, order, offsets = self._columns[col]
+        lookup = dict(lookup)
+        n = len(df) + 1
+
+        # Unchanged rows, as (code, new row) keys; remapping keeps them sorted
+        codes = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        rows = delta.stable_map[order]
+        keep = rows >= 0
+        keys = codes[keep] * n + rows[keep]
+
+        # Added and changed rows
+        values = df[col].iloc[delta.inserted].to_numpy(dtype=object)
+        valid = ~pd.isna(values)
+        new_codes = np.array([lookup.setdefault(value, len(lookup)) for value in values[valid]], dtype=np.int64)
+        new_keys = np.sort(new_codes * n + delta.inserted[valid])
+        keys = np.insert(keys, np.searchsorted(keys, new_keys), new_keys)
+        codes, rows = np.divmod(keys, n)
+
+        # Renumber values by first appearance, dropping those with no rows left
+        counts = np.bincount(codes, minlength=len(lookup))
+        starts = np.concatenate(([0], np.cumsum(counts)))
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(rows[starts[present]], kind='stable')]
+        sizes = counts[present]
+        new_offsets = np.concatenate(([0], np.cumsum(sizes)))
+        gather = np.repeat(starts[present] - new_offsets[:-1], sizes) + np.arange(new_offsets[-1])
+
+        values = list(lookup)
+        lookup = {values[code]: i for i, code in enumerate(present.tolist())}
+        return lookup, rows[gather].astype(np.int32), new_offsets
+
+    def values(self, col):
+        """Distinct values of a column, in order of first appearance"""
+        return list(self._columns[col][0])
+
+    def rows(self, col, value):
+        """Row positions where col == value, in frame order"""
+        lookup, order, offsets = self._columns[col]
+        code = lookup.get(value)
+        if code is None:
+            return order[:0]
+        return order[offsets[code]:offsets[code + 1]]
+
+    def rows_in(self, col, values):
+        """Row positions where col is any of values, in frame order"""
+        if len(values) == 1:
+            return self.rows(col, values[0])
+        return np.sort(np.concatenate([self.rows(col, value) for value in values]))
+
+    def reports(self, col, value):
+        """Report names where col == value, in frame order"""
+        return self.names[self.rows(col, value)].tolist()
+
+    def first_row(self, col, value):
+        """Position of the first row where col == value, or None"""
+        rows = self.rows(col, value)
+        return int(rows[0]) if len(rows) else None
+
+    def lookup(self, criteria_dict):
+        """Row positions matching every column:value pair, in frame order"""
+        rows = None
+        for col, val in criteria_dict.items():
+            matches = self.rows(col, val)
+            rows = matches if rows is None else np.intersect1d(rows, matches, assume_unique=True)
+        if rows is None:
+            return np.arange(len(self.frame), dtype=np.int32)
+        return rows
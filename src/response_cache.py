@@ -0,0 +1,151 @@
+# src/response_cache.py
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized response bodies, with an optional TTL
+
+    Entries belong to one catalog version: the first lookup made with a new
+    version drops everything cached for the previous one, unless rebase()
+    already carried the still valid entries over to it. Concurrent misses on
+    the same key share one build. Lookups made with a version the cache has
+    already moved past (a request still reading the previous catalog) are
+    misses that leave the cache as it is.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, body)
+        self._version = None
+        self._retired = deque(maxlen=32)  # versions replaced by a later one
+        self._pending = {}  # (version, key) -> Future of the build in progress
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _sync_version(self, version):
+        """Move the cache to version; returns False if version is one it has moved past"""
+        if version != self._version:
+            if version in self._retired:
+                return False
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._retired.append(self._version)
+            self._version = version
+        return True
+
+    def get(self, version, key):
+        """Return the cached body for key, or None"""
+        with self._lock:
+            if not self._sync_version(version):
+                self.misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def put(self, version, key, body):
+        with self._lock:
+            # Drop bodies built from a catalog version that has since been replaced
+            if version != self._version:
+                return
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[key] = (expires_at, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, version, key, build):
+        """
+        Return the cached body for key, calling build() to create it on a miss
+
+        If another thread is already building the same key, wait for its
+        result (or exception) instead of building it again.
+        """
+        body = self.get(version, key)
+        if body is not None:
+            return body
+
+        with self._lock:
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is not None:
+                # Built and stored since our lookup
+                return entry[1]
+            future = self._pending.get((version, key))
+            building = future is None
+            if building:
+                future = self._pending[(version, key)] = Future()
+
+        if not building:
+            return future.result()
+
+        try:
+            body = build()
+            self.put(version, key, body)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(body)
+        finally:
+            with self._lock:
+                self._pending.pop((version, key), None)
+        return body
+
+    def rebase(self, previous_version, version, keep, update=None):
+        """
+        Move the entries of previous_version over to version instead of dropping them
+
+        Only entries whose key passes keep(key) are kept, with their body replaced
+        by update(key, body) if given; the rest are dropped. Nothing is kept if the
+        cache has already moved past previous_version. Returns the number kept.
+        """
+        with self._lock:
+            if self._version != previous_version:
+                self._sync_version(version)
+                return 0
+            kept = OrderedDict()
+            self._retired.append(previous_version)
+            for key, (expires_at, body) in self._entries.items():
+                if keep(key):
+                    kept[key] = (expires_at, update(key, body) if update else body)
+            if len(kept) < len(self._entries):
+                self.invalidations += 1
+            self._entries = kept
+            self._version = version
+            return len(kept)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,388 @@
+# src/search_index.py
+
+import bisect
+import copy
+import re
+
+import numpy as np
+import pandas as pd
+
+# Columns whose values can be searched by name
+SEARCH_FIELDS = ['report_name', 'report_owner', 'stakeholder']
+
+# Match kinds, best first
+MATCH_KINDS = ['exact', 'prefix', 'word', 'substring', 'fuzzy']
+EXACT, PREFIX, WORD, SUBSTRING, FUZZY = range(len(MATCH_KINDS))
+
+# Lowest trigram similarity reported as a fuzzy match
+FUZZY_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def pad(term):
+    return f"  {term} "
+
+
+def char_table(chars, bits=None):
+    """
+    Table encoding code points as alphabet codes: NUL as 0, chars[i] as i + 1,
+    and any other character as the all-ones code of bits bits (by default the
+    fewest that leave that code free)
+    """
+    bits = bits or (len(chars) + 1).bit_length()
+    table = np.full(max(map(ord, chars), default=0) + 1, (1 << bits) - 1, dtype=np.int64)
+    table[0] = 0
+    table[[ord(char) for char in chars]] = np.arange(1, len(chars) + 1)
+    return table, bits
+
+
+def trigram_pairs(terms, table=None, bits=21, chunk_size=20000):
+    """
+    (term ids, trigram keys) of every trigram of every term, as two arrays
+
+    A trigram key packs three characters into one int64: their code points
+    (21 bits each), or their bits-bit codes in a char_table(). Terms are
+    processed in fixed-width chunks, so no Python loop runs per trigram.
+    """
+    term_ids, keys = [], []
+    for start in range(0, len(terms), chunk_size):
+        chunk = np.array(terms[start:start + chunk_size], dtype=str)
+        width = chunk.dtype.itemsize // 4
+        if width < 3:
+            continue
+        codes = chunk.view(np.uint32).reshape(len(chunk), width).astype(np.int64)
+        if table is not None:
+            known = codes < len(table)
+            codes = np.where(known, table[np.where(known, codes, 0)], (1 << bits) - 1)
+        grams = (codes[:, :-2] << (2 * bits)) | (codes[:, 1:-1] << bits) | codes[:, 2:]
+        ids, positions = np.nonzero(codes[:, 2:] != 0)
+        term_ids.append(ids + start)
+        keys.append(grams[ids, positions])
+    if not keys:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(term_ids), np.concatenate(keys)
+
+
+def trigram_postings(terms, table, bits, first_id=0):
+    """
+    Distinct (term id, trigram key) pairs of padded terms, sorted by key then term id
+
+    With a small alphabet, key and term id fit together in one int64, so the
+    pairs are sorted and deduplicated by a single np.unique.
+    """
+    ids, keys = trigram_pairs([pad(term) for term in terms], table, bits)
+    ids = ids + first_id
+    id_bits = int(ids.max()).bit_length() if len(ids) else 0
+    if 3 * bits + id_bits <= 63:
+        packed = np.unique((keys << id_bits) | ids)
+        return packed & ((1 << id_bits) - 1), packed >> id_bits
+    order = np.lexsort((ids, keys))
+    ids, keys = ids[order], keys[order]
+    distinct = np.ones(len(keys), dtype=bool)
+    distinct[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+    return ids[distinct], keys[distinct]
+
+
+def word_suffixes(terms, first_id=0):
+    """Sorted (suffix, term id, starts the term) of every word of every term"""
+    suffixes = []
+    for term_id, term in enumerate(terms, first_id):
+        for match in _WORD_RE.finditer(term):
+            suffixes.append((term[match.start():], term_id, match.start() == 0))
+        if not term[:1].isalnum():
+            suffixes.append((term, term_id, True))
+    suffixes.sort()
+    return suffixes
+
+
+class SearchIndex:
+    """
+    Type-ahead index over the distinct values of the search fields
+
+    Every distinct value of a field is one term. Lowercased terms and each of
+    their word suffixes are kept in one sorted list, so exact, prefix and
+    word-prefix matches are a binary search plus an array slice. Substring and
+    fuzzy (typo-tolerant) matches use a trigram index: trigram -> ascending
+    term ids, with characters encoded in the index's own alphabet. Term -> row
+    positions is stored like ReportIndex, so results can be restricted to the
+    rows of a find_reports()-style filter. A term can be left with no rows by a
+    catalog update; searches skip it.
+    """
+
+    def __init__(self, df, fields=None):
+        self.fields = list(fields or SEARCH_FIELDS)
+        n_rows = len(df)
+
+        values, field_ids, term_codes = [], [], []
+        # Value -> term id, per field
+        self._lookups = []
+        for field_id, col in enumerate(self.fields):
+            codes, uniques = pd.factorize(df[col])
+            term_codes.append(np.where(codes >= 0, codes + len(values), -1))
+            uniques = uniques.tolist()
+            self._lookups.append(dict(zip(uniques, range(len(values), len(values) + len(uniques)))))
+            values.extend(str(value) for value in uniques)
+            field_ids.append(np.full(len(uniques), field_id, dtype=np.int8))
+
+        self._values = values
+        self._field_ids = np.concatenate(field_ids) if field_ids else np.empty(0, dtype=np.int8)
+        self._terms = [value.lower() for value in values]
+        self._lengths = np.array([len(term) for term in self._terms], dtype=np.int64)
+        n_terms = len(values)
+
+        # Term -> row positions, in frame order
+        term_of_row = np.concatenate(term_codes) if term_codes else np.empty(0, dtype=np.int64)
+        row_of = np.tile(np.arange(n_rows, dtype=np.int32), len(self.fields))
+        valid = term_of_row >= 0
+        order = np.argsort(term_of_row[valid], kind='stable')
+        self._rows = row_of[valid][order]
+        self._row_counts = np.bincount(term_of_row[valid], minlength=n_terms)
+        self._row_offsets = np.concatenate(([0], np.cumsum(self._row_counts)))
+        self.n_rows = n_rows
+
+        # Sorted word suffixes: (suffix, term id, starts the term)
+        suffixes = word_suffixes(self._terms)
+        self._suffixes = [suffix for suffix, _, _ in suffixes]
+        self._suffix_terms = np.array([term_id for _, term_id, _ in suffixes], dtype=np.int64)
+        self._suffix_starts = np.array([start for _, _, start in suffixes], dtype=bool)
+
+        # Trigram -> term ids, over padded terms so that word boundaries count too
+        self._chars = sorted((set(''.join(self._terms)) | set(pad(''))) - {'\0'})
+        self._char_table, self._char_bits = char_table(self._chars)
+        ids, keys = trigram_postings(self._terms, self._char_table, self._char_bits)
+        self._gram_keys, starts = np.unique(keys, return_index=True)
+        self._gram_offsets = np.append(starts, len(keys))
+        self._gram_terms = ids.astype(np.int32)
+        self._gram_counts = np.bincount(ids, minlength=n_terms)
+
+    def updated(self, delta, df):
+        """
+        Index of df, the catalog after delta (a CatalogDelta), derived from this one
+
+        Terms keep their ids. Values first seen in added or changed rows become
+        new terms, whose word suffixes and trigrams are merged into the sorted
+        lists; only the row postings are recomputed for the whole catalog, as
+        array operations. A reordered catalog, or one where over a quarter of
+        the terms are left with no rows, is indexed from scratch.
+        """
+        if not delta.monotonic:
+            return SearchIndex(df, self.fields)
+
+        n = len(df) + 1
+        n_terms = len(self._values)
+
+        # Unchanged rows keep their terms; remapping keeps (term, new row) keys sorted
+        terms = np.repeat(np.arange(n_terms), self._row_counts)
+        rows = delta.stable_map[self._rows]
+        keep = rows >= 0
+        keys = terms[keep] * n + rows[keep]
+
+        # Terms of added and changed rows, creating those not seen before
+        lookups = [dict(lookup) for lookup in self._lookups]
+        new_terms = []
+        new_keys = []
+        for field_id, col in enumerate(self.fields):
+            values = df[col].iloc[delta.inserted].to_numpy(dtype=object)
+            valid = ~pd.isna(values)
+            lookup = lookups[field_id]
+            ids = []
+            for value in values[valid]:
+                term_id = lookup.get(value)
+                if term_id is None:
+                    term_id = lookup[value] = n_terms + len(new_terms)
+                    new_terms.append((str(value), field_id))
+                ids.append(term_id)
+            new_keys.append(np.array(ids, dtype=np.int64) * n + delta.inserted[valid])
+        new_keys = np.sort(np.concatenate(new_keys))
+        keys = np.insert(keys, np.searchsorted(keys, new_keys), new_keys)
+        terms, rows = np.divmod(keys, n)
+
+        row_counts = np.bincount(terms, minlength=n_terms + len(new_terms))
+        if np.count_nonzero(row_counts == 0) > len(row_counts) // 4:
+            return SearchIndex(df, self.fields)
+
+        # New characters get the next alphabet codes, as long as the code width allows
+        new_chars = set(''.join(value.lower() for value, _ in new_terms)) - set(self._chars) - {'\0'}
+        if len(self._chars) + len(new_chars) > (1 << self._char_bits) - 2:
+            return SearchIndex(df, self.fields)
+
+        index = copy.copy(self)
+        index._lookups = lookups
+        index._rows = rows.astype(np.int32)
+        index._row_counts = row_counts
+        index._row_offsets = np.concatenate(([0], np.cumsum(row_counts)))
+        index.n_rows = len(df)
+        if new_chars:
+            index._chars = self._chars + sorted(new_chars)
+            index._char_table, _ = char_table(index._chars, self._char_bits)
+        if new_terms:
+            index._add_terms(new_terms)
+        return index
+
+    def _add_terms(self, new_terms):
+        """Append (value, field id) terms, merging their word suffixes and trigrams into copies of the sorted lists"""
+        first_id = len(self._values)
+        values = [value for value, _ in new_terms]
+        terms = [value.lower() for value in values]
+        self._values = self._values + values
+        self._field_ids = np.concatenate((self._field_ids, np.array([f for _, f in new_terms], dtype=np.int8)))
+        self._terms = self._terms + terms
+        self._lengths = np.concatenate((self._lengths, np.array([len(term) for term in terms], dtype=np.int64)))
+
+        # New term ids are the largest, so each suffix goes after the equal ones
+        suffixes = word_suffixes(terms, first_id)
+        positions = [bisect.bisect_right(self._suffixes, suffix) for suffix, _, _ in suffixes]
+        merged = list(self._suffixes)
+        for i, (position, (suffix, _, _)) in enumerate(zip(positions, suffixes)):
+            merged.insert(position + i, suffix)
+        self._suffixes = merged
+        self._suffix_terms = np.insert(self._suffix_terms, positions,
+                                       np.array([term_id for _, term_id, _ in suffixes], dtype=np.int64))
+        self._suffix_starts = np.insert(self._suffix_starts, positions,
+                                        np.array([start for _, _, start in suffixes], dtype=bool))
+
+        # Likewise each trigram posting goes at the end of its key's run
+        ids, keys = trigram_postings(terms, self._char_table, self._char_bits, first_id)
+        all_keys = np.repeat(self._gram_keys, np.diff(self._gram_offsets))
+        positions = np.searchsorted(all_keys, keys, side='right')
+        all_keys = np.insert(all_keys, positions, keys)
+        self._gram_terms = np.insert(self._gram_terms, positions, ids.astype(np.int32))
+        starts = np.flatnonzero(np.concatenate(([True], all_keys[1:] != all_keys[:-1]))) if len(all_keys) else \
+            np.empty(0, dtype=np.int64)
+        self._gram_keys = all_keys[starts]
+        self._gram_offsets = np.append(starts, len(all_keys))
+        self._gram_counts = np.concatenate((self._gram_counts, np.bincount(ids - first_id, minlength=len(terms))))
+
+    def _term_counts(self, rows, fields):
+        """Rows of each term, counting only the given rows and fields"""
+        if rows is None:
+            counts = self._row_counts.copy()
+        else:
+            mask = np.zeros(self.n_rows, dtype=np.int64)
+            mask[rows] = 1
+            # Terms left without rows have empty segments, so take differences of a running sum
+            running = np.concatenate(([0], np.cumsum(mask[self._rows])))
+            counts = running[self._row_offsets[1:]] - running[self._row_offsets[:-1]]
+        if fields is not None:
+            wanted = [self.fields.index(field) for field in fields if field in self.fields]
+            counts[~np.isin(self._field_ids, wanted)] = 0
+        return counts
+
+    def _prefix_matches(self, query, counts, limit):
+        """{term id: (kind, 0.0)} for exact, prefix and word-prefix matches"""
+        lo = bisect.bisect_left(self._suffixes, query)
+        hi = bisect.bisect_left(self._suffixes, query + '\U0010ffff')
+        terms = self._suffix_terms[lo:hi]
+        starts = self._suffix_starts[lo:hi]
+        keep = counts[terms] > 0
+        terms, starts = terms[keep], starts[keep]
+
+        kinds = np.where(starts, PREFIX, WORD)
+        kinds[starts & (self._lengths[terms] == len(query))] = EXACT
+        rank = kinds * (1 << 32) + self._lengths[terms]
+
+        # A term can match through several words, so keep some spare candidates.
+        # Suffixes are sorted, so ties at the cutoff keep the alphabetically first.
+        take = min(len(rank), 4 * limit)
+        if take < len(rank):
+            cutoff = np.partition(rank, take - 1)[take - 1]
+            below = np.flatnonzero(rank < cutoff)
+            ties = np.flatnonzero(rank == cutoff)[:take - len(below)]
+            first = np.sort(np.concatenate((below, ties)))
+            terms, kinds, rank = terms[first], kinds[first], rank[first]
+
+        matches = {}
+        for i in np.argsort(rank, kind='stable'):
+            term_id = int(terms[i])
+            if term_id not in matches:
+                matches[term_id] = (int(kinds[i]), 0.0)
+        return matches
+
+    def _shared_trigrams(self, keys):
+        """Number of the given trigram keys found in each term"""
+        found = np.minimum(np.searchsorted(self._gram_keys, keys), len(self._gram_keys) - 1)
+        found = found[self._gram_keys[found] == keys]
+        if not len(found):
+            return np.zeros(len(self._values), dtype=np.int64)
+        postings = np.concatenate([
+            self._gram_terms[self._gram_offsets[g]:self._gram_offsets[g + 1]] for g in found
+        ])
+        return np.bincount(postings, minlength=len(self._values))
+
+    def _trigram_matches(self, query, counts, limit, matches):
+        """Add substring and fuzzy matches found through the trigram index"""
+        if not len(self._gram_keys):
+            return
+        # Trigrams are counted by code point, since characters outside the
+        # alphabet share one code (and are never found)
+        n_inner = len(np.unique(trigram_pairs([query])[1]))
+        inner = np.unique(trigram_pairs([query], self._char_table, self._char_bits)[1])
+        shared = self._shared_trigrams(inner)
+        excluded = counts == 0
+        if matches:
+            excluded[list(matches)] = True
+
+        # Terms containing every trigram of the query, shortest first, are substring candidates
+        candidates = np.flatnonzero((shared == n_inner) & ~excluded)
+        candidates = candidates[np.argsort(self._lengths[candidates], kind='stable')]
+        for term_id in candidates[:50 * limit].tolist():
+            if len(matches) >= limit:
+                return
+            if query in self._terms[term_id]:
+                matches[term_id] = (SUBSTRING, 1.0)
+                excluded[term_id] = True
+
+        # Anything else sharing enough trigrams (including those at word boundaries) is a fuzzy match
+        n_keys = len(np.unique(trigram_pairs([pad(query)])[1]))
+        keys = np.unique(trigram_pairs([pad(query)], self._char_table, self._char_bits)[1])
+        shared += self._shared_trigrams(np.setdiff1d(keys, inner, assume_unique=True))
+        shared[excluded] = 0
+        similarity = shared / np.maximum(n_keys + self._gram_counts - shared, 1)
+        candidates = np.flatnonzero(similarity >= FUZZY_THRESHOLD)
+        take = min(len(candidates), limit - len(matches))
+        if take <= 0:
+            return
+        best = candidates
+        if take < len(candidates):
+            # Ties at the cutoff are settled as in the final ranking (shortest, then alphabetical)
+            cutoff = -np.partition(-similarity[candidates], take - 1)[take - 1]
+            above = candidates[similarity[candidates] > cutoff]
+            ties = sorted(candidates[similarity[candidates] == cutoff].tolist(),
+                          key=lambda term_id: (self._lengths[term_id], self._terms[term_id], term_id))
+            best = np.concatenate((above, np.array(ties[:take - len(above)], dtype=above.dtype)))
+        for term_id in best.tolist():
+            matches[term_id] = (FUZZY, float(similarity[term_id]))
+
+    def search(self, query, limit=10, rows=None, fields=None):
+        """
+        Top matches for query, best first
+
+        rows restricts matches to those row positions (e.g. ReportIndex.lookup()
+        of some filters) and fields to some of the search fields. Each result is
+        {"field", "value", "match", "score", "reports"}, where reports counts the
+        matching rows with that value.
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+
+        counts = self._term_counts(rows, fields)
+        matches = self._prefix_matches(query, counts, limit)
+        if len(matches) < limit and len(query) >= 3:
+            self._trigram_matches(query, counts, limit, matches)
+
+        ranked = sorted(matches.items(), key=lambda item: (
+            item[1][0], -item[1][1], self._lengths[item[0]], self._terms[item[0]], item[0]
+        ))
+        return [
+            {
+                "field": self.fields[self._field_ids[term_id]],
+                "value": self._values[term_id],
+                "match": MATCH_KINDS[kind],
+                "score": round(score, 3) if kind == FUZZY else 1.0,
+                "reports": int(counts[term_id]),
+            }
+            for term_id, (kind, score) in ranked[:limit]
+        ]
+
@@ -0,0 +1,84 @@
+# src/timeline.py
+
+
+def _link_arrays(fig):
+    link = fig['data'][0]['link']
+    return link['source'], link['target'], link['value'], link['color']
+
+
+def roadmap_timeline(views, names):
+    """
+    Merge the views of one owner across roadmap quarters into a base figure and per-quarter deltas
+
+    views are SankeyView tuples in roadmap order, names their frame names. All
+    quarters are laid out on one set of nodes and links: those of the first
+    view, followed by any that only appear later. The base figure is the first
+    view on that layout (links it lacks have value 0); each frame lists the
+    link values and node report counts that differ from the base as
+    [index, value] pairs, and the timeline index of each of its own view's
+    nodes, so drill-down requests can address that view.
+    """
+    node_keys = {}  # (stage column, label) -> timeline node index
+    labels, colors, xs = [], [], []
+    link_keys = {}  # (timeline source, timeline target) -> timeline link index
+    link_sources, link_targets, link_colors = [], [], []
+
+    frame_nodes = []
+    frame_values = []
+    frame_counts = []
+    for view in views:
+        node = view.fig['data'][0]['node']
+        nodes = []
+        for k, (col, label) in enumerate(zip(view.node_columns, view.all_nodes)):
+            index = node_keys.get((col, label))
+            if index is None:
+                index = node_keys[(col, label)] = len(labels)
+                labels.append(label)
+                colors.append(node['color'][k])
+                xs.append(node['x'][k])
+            nodes.append(index)
+
+        values = {}
+        for source, target, value, color in zip(*_link_arrays(view.fig)):
+            key = (nodes[source], nodes[target])
+            index = link_keys.get(key)
+            if index is None:
+                index = link_keys[key] = len(link_sources)
+                link_sources.append(key[0])
+                link_targets.append(key[1])
+                link_colors.append(color)
+            values[index] = value
+
+        frame_nodes.append(nodes)
+        frame_values.append(values)
+        frame_counts.append({nodes[k]: len(rows) for k, rows in view.node_rows.items()})
+
+    base_values = [frame_values[0].get(i, 0) for i in range(len(link_sources))]
+    base_counts = [frame_counts[0].get(i, 0) for i in range(len(labels))]
+
+    base = views[0].fig
+    figure = {
+        'data': [dict(base['data'][0],
+                      node=dict(base['data'][0]['node'], label=labels, color=colors, x=xs),
+                      link={'source': link_sources, 'target': link_targets, 'value': base_values,
+                            'color': link_colors})],
+        'layout': base['layout'],
+    }
+
+    frames = []
+    for name, view, nodes, values, counts in zip(names, views, frame_nodes, frame_values, frame_counts):
+        frames.append({
+            'name': name,
+            'title': view.fig['layout']['title']['text'],
+            'values': [[i, values.get(i, 0)] for i, value in enumerate(base_values) if values.get(i, 0) != value],
+            'node_counts': [[i, counts.get(i, 0)] for i, count in enumerate(base_counts) if counts.get(i, 0) != count],
+            'nodes': nodes,
+            'stats': view.stats,
+        })
+
+    return {
+        'plot': figure,
+        'node_data': dict(enumerate(labels)),
+        'node_counts': dict(enumerate(base_counts)),
+        'frames': frames,
+    }
@@ -3,11 +3,16 @@
 $(document).ready(function() {
     // State variables
     let nodeData = {};
-    let nodeReports = {};
-    let linkReports = {};
+    let nodeCounts = {};
+    let linkCounts = {};
+    let currentView = {}; // Owner and quarter of the diagram on screen
     let animationInterval = null;
-    let currentReports = []; // Store current selected reports
     let isLoading = false;
+    let timeline = null; // Base figure and per-quarter frames of the owner on screen
+    let timelineKey = null;
+    let pendingTimelineKey = null; // Owner and bucketing of the timeline being fetched
+    let frameNodes = null; // Timeline index of each node of the quarter on screen
+    let listObservers = []; // Load further pages as the end of each reports list scrolls into view
 
     // Load owners for dropdown
     $.get('/get_owners', function(data) {
@@ -23,12 +28,13 @@ $(document).ready(function() {
     });
 
     // Event handlers
-    $('#owner-select').change(loadSankey);
+    $('#owner-select').change(function() { loadSankey(); });
+    $('#top-select').change(function() { loadSankey(); });
 
     $('.time-btn').click(function() {
         $('.time-btn').removeClass('active');
         $(this).addClass('active');
-        loadSankey();
+        loadSankey(true);
 
         // Update transformation progress
         updateTransformationProgress();
@@ -47,7 +53,7 @@ $(document).ready(function() {
             // Reset to current state
             $('.time-btn').removeClass('active');
             $('.time-btn:first-child').addClass('active');
-            loadSankey();
+            loadSankey(true);
             updateTransformationProgress();
 
             let currentIndex = 0;
@@ -57,7 +63,7 @@ $(document).ready(function() {
                 currentIndex = (currentIndex + 1) % timeButtons.length;
                 timeButtons.removeClass('active');
                 $(timeButtons[currentIndex]).addClass('active');
-                loadSankey();
+                loadSankey(true);
                 updateTransformationProgress();
 
                 if (currentIndex === timeButtons.length - 1) {
@@ -87,30 +93,145 @@ $(document).ready(function() {
         displayAllReports();
     });
 
-    // Function to load the Sankey diagram
-    function loadSankey() {
-        // Clear any existing loading indicators first
-        $('#sankey-container .loading').remove();
+    // Show details of a clicked report (one handler for every rendered list item)
+    $('#reports-list-container').on('click', '.reports-list li.report-item', function() {
+        // Remove previous selection
+        $('.reports-list li').removeClass('selected');
+        // Add selection to current item
+        $(this).addClass('selected');
+        // Show details
+        showReportDetails($(this).text(), $(this));
+    });
 
-        // Prevent multiple simultaneous loads
-        if (isLoading) return;
-        isLoading = true;
+    // Type-ahead search over report names, owners and stakeholders
+    const fieldLabels = {
+        report_name: 'Report',
+        report_owner: 'Owner',
+        stakeholder: 'Stakeholder'
+    };
+    let searchTimer = null;
+    let searchRequest = null;
+
+    $('#report-search').on('input', function() {
+        const query = $(this).val().trim();
+        clearTimeout(searchTimer);
+        if (!query) {
+            $('#search-results').empty().hide();
+            return;
+        }
+        // Wait for a pause in typing before asking the server
+        searchTimer = setTimeout(function() {
+            searchReports(query);
+        }, 150);
+    });
 
-        // Show loading indicator
-        const loadingDiv = $('<div class="loading">Loading diagram...</div>');
-        $('#sankey-container').html(loadingDiv);
+    $('#report-search').on('keydown', function(event) {
+        const items = $('#search-results li');
+        if (!items.length) return;
+
+        let active = items.index(items.filter('.active'));
+        if (event.key === 'ArrowDown' || event.key === 'ArrowUp') {
+            active = event.key === 'ArrowDown' ? Math.min(active + 1, items.length - 1) : Math.max(active - 1, 0);
+            items.removeClass('active');
+            $(items[active]).addClass('active');
+            event.preventDefault();
+        } else if (event.key === 'Enter') {
+            $(items[Math.max(active, 0)]).click();
+            event.preventDefault();
+        } else if (event.key === 'Escape') {
+            $('#search-results').empty().hide();
+        }
+    });
 
-        // Safety timeout - if loading takes more than 15 seconds, clear it
-        const loadingTimeout = setTimeout(function() {
-            if (isLoading) {
-                isLoading = false;
-                $('#sankey-container .loading').fadeOut(function() {
-                    $(this).remove();
-                });
+    $('#search-results').on('click', 'li', function() {
+        const result = $(this).data('result');
+        if (!result) return;
+        $('#search-results').empty().hide();
+        $('#report-search').val(result.value);
+        openSearchResult(result);
+    });
+
+    // Hide suggestions when clicking elsewhere
+    $(document).on('click', function(event) {
+        if (!$(event.target).closest('.search-box').length) {
+            $('#search-results').hide();
+        }
+    });
+
+    function searchReports(query) {
+        // Only the latest request matters while typing
+        if (searchRequest) searchRequest.abort();
+
+        searchRequest = $.get('/search', { q: query, limit: 8 }, function(data) {
+            const results = $('#search-results');
+            results.empty();
+
+            if (data.error || data.results.length === 0) {
+                results.append($('<li>').text('No matches'));
+                results.show();
+                return;
             }
-        }, 15000);
 
+            data.results.forEach(result => {
+                const item = $('<li>').data('result', result);
+                item.append($('<span>').text(result.value));
+                item.append($('<span class="search-field">').text(
+                    result.field === 'report_name' ? fieldLabels[result.field] : `${fieldLabels[result.field]} · ${result.reports}`
+                ));
+                results.append(item);
+            });
+            results.show();
+        });
+    }
+
+    // Show the report, owner or stakeholder picked from the search results
+    function openSearchResult(result) {
+        if (result.field === 'report_owner') {
+            $('#owner-select').val(result.value);
+            loadSankey();
+            return;
+        }
+
+        const container = $('#reports-list-container');
+        disconnectReportLists();
+        container.empty();
+
+        if (result.field === 'report_name') {
+            container.append($('<h3>').text('Search result'));
+            container.append($('<div id="report-details-container"></div>'));
+            showReportDetails(result.value);
+        } else {
+            container.append($('<h3>').text(`Reports for stakeholder ${result.value}`));
+            const list = $('<ul class="reports-list"></ul>');
+            const status = $('<p class="reports-list-status"></p>');
+            container.append(list, status, $('<div id="report-details-container"></div>'));
+
+            $.get('/search', { stakeholder: result.value, limit: 100 }, function(data) {
+                if (data.error) return;
+                const fragment = document.createDocumentFragment();
+                data.reports.forEach((report, index) => {
+                    const item = document.createElement('li');
+                    item.className = `report-item ${report.automation_level.toLowerCase()}-marker`;
+                    item.textContent = report.report_name;
+                    item.style.setProperty('--index', index);
+                    fragment.appendChild(item);
+                });
+                list.append(fragment);
+                status.text(data.total > data.reports.length ? `Showing ${data.reports.length} of ${data.total}` : `${data.total} reports`);
+            });
+        }
+
+        // Scroll to reports container
+        $('html, body').animate({
+            scrollTop: container.offset().top - 20
+        }, 500);
+    }
+
+    // Function to load the Sankey diagram; stepping through quarters
+    // (useTimeline) also fetches the owner's whole roadmap timeline
+    function loadSankey(useTimeline) {
         // Clear the reports list when loading new data
+        disconnectReportLists();
         $('#reports-list-container').empty();
 
         const selectedOwner = $('#owner-select').val();
@@ -141,77 +262,240 @@ $(document).ready(function() {
             $('#transformation-progress-text').text('Transformation Progress: 0%');
         }
 
-        $.get('/get_sankey', {
-            owner: selectedOwner,
-            quarter: quarter,
-            year: year
-        }, function(data) {
-            // Clear loading timeout
-            clearTimeout(loadingTimeout);
+        // Fold all but the largest nodes of each stage into "Other (n)" if selected
+        const view = selectedView();
+        const top = view.top || '';
+
+        // Every quarter of the owner's roadmap comes in one response; once it
+        // is loaded, switching quarters only redraws the diagram locally
+        const key = `${selectedOwner}|${top}`;
+        if (timeline && timelineKey === key) {
+            showTimelineFrame(view);
+            return;
+        }
+        if (useTimeline) {
+            loadTimeline(key, selectedOwner, top);
+        }
 
-            // Store the node and link data
-            nodeData = data.node_data;
-            nodeReports = data.node_reports;
-            linkReports = data.link_reports;
+        // Prevent multiple simultaneous loads
+        if (isLoading) return;
+        isLoading = true;
 
-            // Parse the Plotly figure
-            const figure = JSON.parse(data.plot);
+        // Show loading indicator
+        $('#sankey-container .loading').remove();
+        const loadingDiv = $('<div class="loading">Loading diagram...</div>');
+        $('#sankey-container').html(loadingDiv);
 
-            // Configure hover mode to be more persistent
-            if (figure.layout) {
-                figure.layout.hovermode = 'closest';
-                figure.layout.hoverdistance = 100;
+        // Safety timeout - if loading takes more than 15 seconds, clear it
+        const loadingTimeout = setTimeout(function() {
+            if (isLoading) {
+                isLoading = false;
+                $('#sankey-container .loading').fadeOut(function() {
+                    $(this).remove();
+                });
+            }
+        }, 15000);
 
-                // Increase font size of labels
-                if (figure.layout.font) {
-                    figure.layout.font.size = 14;
-                }
+        // First paint: stream the selected quarter's figure and counts, and stop
+        // reading once its stats arrive (report lists are paged in on click)
+        streamNdjson('/get_sankey', $.extend({ format: 'ndjson' }, view), function(message) {
+            if (timelineKey === key) {
+                // The timeline arrived first and is already on screen
+                clearTimeout(loadingTimeout);
+                isLoading = false;
+                return false;
+            }
+            if (message.type === 'plot') {
+                clearTimeout(loadingTimeout);
+                nodeData = message.node_data;
+                nodeCounts = message.node_counts;
+                linkCounts = message.link_counts;
+                frameNodes = null;
+                currentView = view;
+                drawFigure(message.plot);
+                isLoading = false;
+            } else if (message.type === 'stats') {
+                updateStats(message.stats);
+                updateTransformationSummary(message.stats);
+                return false;
             }
+        })
+        .catch(function(error) {
+            console.error("Error loading data:", error);
+            $('#sankey-container').html('<div class="error-message">Error loading diagram. Please try again.</div>');
+            isLoading = false;
+            clearTimeout(loadingTimeout);
+        });
+    }
 
-            // Remove loading indicator
+    // Fetch every quarter of an owner's roadmap for local stepping, once the
+    // quarter controls are used
+    function loadTimeline(key, owner, top) {
+        if (pendingTimelineKey === key) return;
+        pendingTimelineKey = key;
+
+        const query = { owner: owner };
+        if (top) {
+            query.top = top;
+        }
+
+        $.get('/get_sankey_timeline', query, function(data) {
+            // Ignore a timeline the user has already moved away from
+            if (pendingTimelineKey !== key) return;
+            pendingTimelineKey = null;
+            const view = selectedView();
+            if (`${view.owner}|${view.top || ''}` !== key) return;
+            timeline = data;
+            timelineKey = key;
+
+            // Replace the streamed figure with the timeline's layout of nodes and links
             $('#sankey-container .loading').remove();
+            drawFigure(data.plot);
+            isLoading = false;
 
-            // Create Plotly diagram with improved configuration
-            Plotly.newPlot('sankey-container', figure.data, figure.layout, {
-                displayModeBar: true,
-                modeBarButtonsToRemove: ['toImage', 'sendDataToCloud'],
-                responsive: true
-            });
+            // Show the quarter selected now, which may have changed since the request
+            showTimelineFrame(view);
+        })
+        .fail(function(error) {
+            console.error("Error loading roadmap timeline:", error);
+            pendingTimelineKey = null;
+        });
+    }
 
-            // Add click event listener
-            document.getElementById('sankey-container').on('plotly_click', function(clickData) {
-                handlePlotlyClick(clickData);
-            });
+    // Draw a new figure in place of the diagram on screen
+    function drawFigure(figure) {
+        // Configure hover mode to be more persistent
+        if (figure.layout) {
+            figure.layout.hovermode = 'closest';
+            figure.layout.hoverdistance = 100;
 
-            // Make tooltips more stable by adding hover event
-            document.getElementById('sankey-container').on('plotly_hover', function(hoverData) {
-                // Capture hover events to keep tooltips visible longer in inspect mode
-                if ($('#sankey-container').hasClass('inspect-mode')) {
-                    // Keep tooltip visible
-                    $('.js-plotly-plot .plotly .hoverlayer').css('opacity', 1);
-                }
-            });
+            // Increase font size of labels
+            if (figure.layout.font) {
+                figure.layout.font.size = 14;
+            }
+        }
 
-            // Update statistics directly from the data
-            if (data.stats) {
-                updateStats(data.stats);
-            } else {
-                // Fallback to counting reports if stats not provided by server
-                countReportsFromNodeData();
+        // Remove loading indicator
+        $('#sankey-container .loading').remove();
+
+        // Create Plotly diagram with improved configuration
+        Plotly.newPlot('sankey-container', figure.data, figure.layout, {
+            displayModeBar: true,
+            modeBarButtonsToRemove: ['toImage', 'sendDataToCloud'],
+            responsive: true
+        });
+
+        // Add click event listener
+        document.getElementById('sankey-container').on('plotly_click', function(clickData) {
+            handlePlotlyClick(clickData);
+        });
+
+        // Make tooltips more stable by adding hover event
+        document.getElementById('sankey-container').on('plotly_hover', function(hoverData) {
+            // Capture hover events to keep tooltips visible longer in inspect mode
+            if ($('#sankey-container').hasClass('inspect-mode')) {
+                // Keep tooltip visible
+                $('.js-plotly-plot .plotly .hoverlayer').css('opacity', 1);
             }
+        });
+    }
 
-            // Update the transformation summary
-            updateTransformationSummary(data.stats);
+    // Read a newline-delimited JSON response, calling onMessage with each line as
+    // soon as it arrives; returning false from onMessage cancels the rest
+    function streamNdjson(url, params, onMessage) {
+        const controller = new AbortController();
+        return fetch(`${url}?${$.param(params)}`, { signal: controller.signal }).then(function(response) {
+            if (!response.ok) {
+                throw new Error(`${response.status} ${response.statusText}`);
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            function read() {
+                return reader.read().then(function({ done, value }) {
+                    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                    const lines = buffer.split('\n');
+                    buffer = lines.pop();
+                    for (const line of lines) {
+                        if (!line) continue;
+                        const message = JSON.parse(line);
+                        if (message.type === 'error') {
+                            // The server failed after sending the status line
+                            controller.abort();
+                            throw new Error(message.error);
+                        }
+                        if (onMessage(message) === false) {
+                            controller.abort();
+                            return;
+                        }
+                    }
+                    if (!done) {
+                        return read();
+                    }
+                });
+            }
+            return read();
+        });
+    }
 
-            // Reset loading state
-            isLoading = false;
-        })
-        .fail(function(error) {
-            console.error("Error loading data:", error);
-            $('#sankey-container').html('<div class="error-message">Error loading diagram. Please try again.</div>');
-            isLoading = false;
-            clearTimeout(loadingTimeout);
+    // Owner, quarter and node bucketing currently selected on the page
+    function selectedView() {
+        const selectedTimeBtn = $('.time-btn.active');
+        const view = {
+            owner: $('#owner-select').val(),
+            quarter: selectedTimeBtn.data('quarter'),
+            year: selectedTimeBtn.data('year')
+        };
+        const top = $('#top-select').val();
+        if (top) {
+            view.top = top;
+        }
+        return view;
+    }
+
+    // Redraw the diagram for one quarter of the loaded timeline: the frame's
+    // link values and node counts replace the base ones where they differ
+    function showTimelineFrame(view) {
+        const frameIndex = timeline.quarters.findIndex(q =>
+            String(q.quarter) === String(view.quarter) && String(q.year) === String(view.year));
+        const frame = timeline.frames[Math.max(frameIndex, 0)];
+        const base = timeline.plot.data[0];
+
+        const values = base.link.value.slice();
+        frame.values.forEach(([i, value]) => { values[i] = value; });
+
+        nodeData = timeline.node_data;
+        nodeCounts = $.extend({}, timeline.node_counts);
+        frame.node_counts.forEach(([i, count]) => { nodeCounts[i] = count; });
+        linkCounts = {};
+        values.forEach((value, i) => {
+            if (value) {
+                linkCounts[`${base.link.source[i]}-${base.link.target[i]}`] = value;
+            }
         });
+        frameNodes = frame.nodes;
+        currentView = view;
+
+        const trace = $.extend({}, base, { link: $.extend({}, base.link, { value: values }) });
+        const layout = $.extend({}, timeline.plot.layout, { title: { text: frame.title } });
+        Plotly.react('sankey-container', [trace], layout);
+
+        // Update statistics directly from the data
+        if (frame.stats) {
+            updateStats(frame.stats);
+        } else {
+            // Fallback to counting reports if stats not provided by server
+            countReportsFromNodeData();
+        }
+
+        // Update the transformation summary
+        updateTransformationSummary(frame.stats);
+    }
+
+    // Index of a timeline node in the view of the quarter on screen, as /get_reports expects
+    function viewNodeIndex(index) {
+        return frameNodes ? frameNodes.indexOf(index) : index;
     }
 
     // Update transformation progress metrics
@@ -356,26 +640,19 @@ $(document).ready(function() {
         }
 
         // Count reports for each automation level
-        const fullyReports = nodeReports[automationNodes['Fully']] || [];
-        const semiReports = nodeReports[automationNodes['Semi']] || [];
-        const tableauReports = nodeReports[automationNodes['Tableau']] || [];
-        const manualReports = nodeReports[automationNodes['Manual']] || [];
-
-        // Calculate total reports
-        const allReports = new Set([
-            ...fullyReports,
-            ...semiReports,
-            ...tableauReports,
-            ...manualReports
-        ]);
+        const fullyCount = nodeCounts[automationNodes['Fully']] || 0;
+        const semiCount = nodeCounts[automationNodes['Semi']] || 0;
+        const tableauCount = nodeCounts[automationNodes['Tableau']] || 0;
+        const manualCount = nodeCounts[automationNodes['Manual']] || 0;
 
+        // Every report has exactly one automation level
         const stats = {
-            total_reports: allReports.size,
+            total_reports: fullyCount + semiCount + tableauCount + manualCount,
             automation_breakdown: {
-                "Fully": fullyReports.length,
-                "Semi": semiReports.length,
-                "Tableau": tableauReports.length,
-                "Manual": manualReports.length
+                "Fully": fullyCount,
+                "Semi": semiCount,
+                "Tableau": tableauCount,
+                "Manual": manualCount
             }
         };
 
@@ -388,17 +665,17 @@ $(document).ready(function() {
         if (!data || !data.points || data.points.length === 0) return;
 
         const point = data.points[0];
-        let reports = [];
+        let query = null;
+        let total = 0;
         let title = '';
-        let categoryName = '';
 
         if (point.pointNumber !== undefined) {
             // This is a node
             const nodeIndex = point.pointNumber;
             const nodeName = nodeData[nodeIndex];
             title = `Reports for ${nodeName}`;
-            reports = nodeReports[nodeIndex] || [];
-            categoryName = nodeName;
+            query = { node: viewNodeIndex(nodeIndex) };
+            total = nodeCounts[nodeIndex] || 0;
         } else if (point.source && point.target) {
             // This is a link
             const sourceIndex = point.source.index;
@@ -407,50 +684,124 @@ $(document).ready(function() {
             const targetName = nodeData[targetIndex];
 
             title = `Reports from ${sourceName} to ${targetName}`;
-            reports = linkReports[`${sourceIndex}-${targetIndex}`] || [];
-            categoryName = `${sourceName} to ${targetName}`;
+            query = { link: `${viewNodeIndex(sourceIndex)}-${viewNodeIndex(targetIndex)}` };
+            total = linkCounts[`${sourceIndex}-${targetIndex}`] || 0;
         }
 
-        // Store current reports
-        currentReports = reports;
-
         // Display reports below chart
-        displayReportsList(title, reports, categoryName);
+        displayReportsList(title, query, total);
+    }
+
+    // Build a sort selector for the reports list; onChange receives the chosen sort
+    function createSortSelect(onChange) {
+        const select = $(`
+            <select class="reports-sort">
+                <option value="name">Name (A-Z)</option>
+                <option value="-name">Name (Z-A)</option>
+                <option value="catalog">Catalog order</option>
+            </select>
+        `);
+        select.change(function() {
+            onChange($(this).val());
+        });
+        return select;
+    }
+
+    // Fill a list with the reports matching query, one page at a time.
+    // The next page is requested only when the end of the list scrolls into view.
+    function loadReportPages(list, query, sort, markerClass) {
+        list.empty();
+        const status = list.next('.reports-list-status');
+        const sentinel = $('<li class="list-sentinel"></li>');
+        list.append(sentinel);
+
+        let cursor = null;
+        let pending = false;
+        let loaded = 0;
+
+        function loadPage() {
+            if (pending) return;
+            pending = true;
+
+            const params = $.extend({}, currentView, query, { sort: sort });
+            if (cursor) params.cursor = cursor;
+
+            $.get('/get_reports', params, function(data) {
+                pending = false;
+                if (data.error) {
+                    console.error(data.error);
+                    return;
+                }
+
+                // Render the page in one DOM insertion
+                const fragment = document.createDocumentFragment();
+                data.reports.forEach((report, index) => {
+                    const item = document.createElement('li');
+                    item.className = `report-item ${markerClass || ''}`;
+                    item.textContent = report;
+                    // Set animation delay using CSS variable
+                    item.style.setProperty('--index', index);
+                    fragment.appendChild(item);
+                });
+                sentinel.before(fragment);
+
+                loaded += data.reports.length;
+                cursor = data.next_cursor;
+                status.text(cursor ? `Showing ${loaded} of ${data.total}` : `${data.total} reports`);
+
+                if (cursor) {
+                    // Keep loading while the end of the list is still visible
+                    observer.unobserve(sentinel[0]);
+                    observer.observe(sentinel[0]);
+                } else {
+                    observer.disconnect();
+                    sentinel.remove();
+                }
+            }).fail(function(error) {
+                pending = false;
+                console.error("Error loading reports:", error);
+            });
+        }
+
+        const observer = new IntersectionObserver(function(entries) {
+            if (entries.some(entry => entry.isIntersecting)) loadPage();
+        }, { root: list[0], rootMargin: '200px' });
+        observer.observe(sentinel[0]);
+        return observer;
+    }
+
+    // Stop loading pages for lists that are no longer displayed
+    function disconnectReportLists() {
+        listObservers.forEach(observer => observer.disconnect());
+        listObservers = [];
     }
 
     // Display reports in the reports list container
-    function displayReportsList(title, reports, categoryName) {
+    function displayReportsList(title, query, total) {
         const container = $('#reports-list-container');
+        disconnectReportLists();
         container.empty();
 
         // Create section title
         const sectionTitle = $('<h3>').text(title);
         container.append(sectionTitle);
 
-        if (!reports || reports.length === 0) {
+        if (!query || total === 0) {
             container.append($('<p>').text('No reports found'));
             return;
         }
 
         // Create reports list
         const list = $('<ul class="reports-list"></ul>');
-        reports.forEach((report, index) => {
-            const item = $('<li>').text(report);
-            // Set animation delay using CSS variable
-            item.css('--index', index);
-
-            item.click(function() {
-                // Remove previous selection
-                $('.reports-list li').removeClass('selected');
-                // Add selection to current item
-                $(this).addClass('selected');
-                // Show details
-                showReportDetails(report, item);
-            });
-            list.append(item);
-        });
-
-        container.append(list);
+        const status = $('<p class="reports-list-status"></p>');
+        const observers = [];
+        container.append(createSortSelect(function(sort) {
+            observers[0].disconnect();
+            observers[0] = loadReportPages(list, query, sort);
+        }));
+        container.append(list, status);
+        observers.push(loadReportPages(list, query, 'name'));
+        listObservers = observers;
 
         // Add details container
         const detailsContainer = $('<div id="report-details-container"></div>');
@@ -465,64 +816,54 @@ $(document).ready(function() {
     // Function to display all reports grouped by automation level
     function displayAllReports() {
         const container = $('#reports-list-container');
+        disconnectReportLists();
         container.empty();
 
         // Create section title
         const sectionTitle = $('<h3>').text('All Reports by Automation Level');
         container.append(sectionTitle);
 
-        // Get automation levels and their reports
+        // Get automation levels and their report counts
         const automationLevels = [
-            { name: 'Fully', class: 'fully-heading', reports: [] },
-            { name: 'Semi', class: 'semi-heading', reports: [] },
-            { name: 'Tableau', class: 'tableau-heading', reports: [] },
-            { name: 'Manual', class: 'manual-heading', reports: [] }
+            { name: 'Fully', class: 'fully-heading', node: null, count: 0 },
+            { name: 'Semi', class: 'semi-heading', node: null, count: 0 },
+            { name: 'Tableau', class: 'tableau-heading', node: null, count: 0 },
+            { name: 'Manual', class: 'manual-heading', node: null, count: 0 }
         ];
 
-        // Find reports for each level
+        // Find the node of each level
         automationLevels.forEach(level => {
             for (const nodeIndex in nodeData) {
                 if (nodeData[nodeIndex] === level.name) {
-                    level.reports = nodeReports[nodeIndex] || [];
+                    level.node = nodeIndex;
+                    level.count = nodeCounts[nodeIndex] || 0;
                     break;
                 }
             }
         });
 
         let anyReports = false;
+        const observers = [];
 
         // Create a section for each automation level that has reports
         automationLevels.forEach(level => {
-            if (level.reports.length > 0) {
+            if (level.count > 0) {
                 anyReports = true;
 
                 // Create category container
                 const categoryDiv = $('<div class="reports-category"></div>');
-                const levelTitle = $(`<h4 class="${level.class}">${level.name} Reports (${level.reports.length})</h4>`);
+                const levelTitle = $(`<h4 class="${level.class}">${level.name} Reports (${level.count})</h4>`);
                 categoryDiv.append(levelTitle);
 
-                // Create reports list
+                // Create reports list, filled page by page
                 const list = $('<ul class="reports-list"></ul>');
-                level.reports.forEach((report, index) => {
-                    const item = $(`<li class="${level.name.toLowerCase()}-marker"></li>`).text(report);
-                    // Set animation delay using CSS variable
-                    item.css('--index', index);
-
-                    item.click(function() {
-                        // Remove previous selection
-                        $('.reports-list li').removeClass('selected');
-                        // Add selection to current item
-                        $(this).addClass('selected');
-                        // Show details
-                        showReportDetails(report, item);
-                    });
-                    list.append(item);
-                });
-
-                categoryDiv.append(list);
+                const status = $('<p class="reports-list-status"></p>');
+                categoryDiv.append(list, status);
                 container.append(categoryDiv);
+                observers.push(loadReportPages(list, { node: viewNodeIndex(Number(level.node)) }, 'name', `${level.name.toLowerCase()}-marker`));
             }
         });
+        listObservers = observers;
 
         if (!anyReports) {
             container.append($('<p>').text('No reports found'));
@@ -0,0 +1,60 @@
+# tests/test_bucketing.py
+
+import numpy as np
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.bucketing import bucket_stages
+from src.catalog import normalize_reports
+from src.links import STAGE_COLUMNS, all_stage_links, stage_nodes
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return normalize_reports(generate_catalog(600, {'Report_Owner': 10, 'Stakeholder': 40}, seed=7))
+
+
+@pytest.fixture(scope='module')
+def stages_and_layers(catalog):
+    return [stage_nodes(catalog, col) for col in STAGE_COLUMNS], all_stage_links(catalog)
+
+
+@pytest.mark.parametrize('top', [3, 5, 10])
+def test_bucketed_totals_match_unbucketed(stages_and_layers, top):
+    stages, layers = stages_and_layers
+    _, bucketed, members = bucket_stages(stages, layers, top)
+
+    for i, (before, after) in enumerate(zip(layers, bucketed)):
+        assert after.value.sum() == before.value.sum()
+        assert sorted(np.concatenate(after.rows).tolist()) == sorted(np.concatenate(before.rows).tolist())
+        assert [len(rows) for rows in after.rows] == after.value.tolist()
+
+        # Each bucket carries the sum of the links into the values it stands for
+        folded = {value: label for label, values in members[i + 1].items() for value in values}
+        expected = {}
+        for target, value in zip(before.target.tolist(), before.value.tolist()):
+            expected[folded[target]] = expected.get(folded[target], 0) + value
+        totals = {}
+        for target, value in zip(after.target.tolist(), after.value.tolist()):
+            totals[target] = totals.get(target, 0) + value
+        assert totals == expected
+
+
+def test_min_link_drops_only_small_links(stages_and_layers):
+    stages, layers = stages_and_layers
+    _, everything, _ = bucket_stages(stages, layers, 5)
+    _, bucketed, _ = bucket_stages(stages, layers, 5, min_value=3)
+
+    for before, after in zip(everything, bucketed):
+        kept = before.value[before.value >= 3]
+        assert after.value.sum() == kept.sum()
+
+
+@pytest.mark.parametrize('owner', ["All Owners", "Owner 2"])
+def test_bucketed_figure_totals_match_unbucketed(catalog, owner):
+    fig = dashboard.build_sankey(catalog, owner)[0]
+    bucketed = dashboard.build_sankey(catalog, owner, top=4)[0]
+
+    assert sum(bucketed['data'][0]['link']['value']) == sum(fig['data'][0]['link']['value'])
+    assert len(bucketed['data'][0]['node']['label']) < len(fig['data'][0]['node']['label'])
@@ -0,0 +1,31 @@
+# tests/test_catalog.py
+
+import os
+
+import pytest
+
+from src.catalog import atomic_path, write_atomic
+
+
+def test_write_atomic_replaces_target(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_bytes(b'old')
+
+    write_atomic(str(path), b'new')
+
+    assert path.read_bytes() == b'new'
+    assert os.listdir(tmp_path) == ['manifest.json']
+
+
+def test_failed_write_keeps_target_and_removes_temp_file(tmp_path):
+    path = tmp_path / 'reports.feather'
+    path.write_bytes(b'old')
+
+    with pytest.raises(OSError):
+        with atomic_path(str(path)) as tmp:
+            with open(tmp, 'wb') as f:
+                f.write(b'partial')
+            raise OSError("disk full")
+
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['reports.feather']
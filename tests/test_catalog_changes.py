@@ -0,0 +1,200 @@
+# tests/test_catalog_changes.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import CatalogDelta, ReportCatalog, normalize_reports
+from src.link_cube import LinkCube
+from src.links import STAGE_PAIRS, stage_links
+from src.payload import name_ranks, updated_name_ranks
+from src.report_index import ReportIndex
+from src.search_index import SearchIndex
+
+SEEDS = [0, 1, 2]
+
+
+def edit_catalog(raw, rng, removed=5, changed=5, added=5):
+    """Drop, edit and append a few reports of a raw catalog, keeping its row order"""
+    edited = raw.drop(index=rng.choice(len(raw), removed, replace=False)).reset_index(drop=True)
+    rows = rng.choice(len(edited), changed, replace=False)
+    edited.loc[rows, 'Stakeholder'] = rng.choice(edited['Stakeholder'].unique(), changed)
+    new = generate_catalog(added, {'Report_Owner': 12}, seed=int(rng.integers(1 << 30)), missing_names=0)
+    new['Report_Name'] = [f"New report {i}" for i in range(added)]
+    return pd.concat([edited, new], ignore_index=True)
+
+
+def assert_links_equal(actual, expected):
+    assert actual.source.tolist() == expected.source.tolist()
+    assert actual.target.tolist() == expected.target.tolist()
+    assert actual.value.tolist() == expected.value.tolist()
+    assert [rows.tolist() for rows in actual.rows] == [rows.tolist() for rows in expected.rows]
+
+
+def owners(df):
+    return ["All Owners"] + sorted(df['report_owner'].dropna().unique())
+
+
+@pytest.fixture
+def catalogs(request):
+    """A raw synthetic catalog and a random edit of it"""
+    rng = np.random.default_rng(request.param)
+    raw = generate_catalog(400, {'Report_Owner': 12, 'Stakeholder': 40}, seed=request.param)
+    return raw, edit_catalog(raw, rng)
+
+
+@pytest.mark.parametrize('catalogs', SEEDS, indirect=True)
+def test_updated_index_matches_rebuild(catalogs):
+    old, new = (normalize_reports(raw) for raw in catalogs)
+    delta = CatalogDelta(old, new)
+
+    updated = ReportIndex(old).updated(delta, new)
+    rebuilt = ReportIndex(new)
+
+    for col in rebuilt._columns:
+        assert updated.values(col) == rebuilt.values(col)
+        for value in rebuilt.values(col):
+            assert updated.rows(col, value).tolist() == rebuilt.rows(col, value).tolist()
+
+
+@pytest.mark.parametrize('catalogs', SEEDS, indirect=True)
+def test_updated_search_index_matches_rebuild(catalogs):
+    old, new = (normalize_reports(raw) for raw in catalogs)
+    delta = CatalogDelta(old, new)
+
+    updated = SearchIndex(old).updated(delta, new)
+    rebuilt = SearchIndex(new)
+
+    owner_rows = ReportIndex(new).lookup({'report_owner': 'Owner 3'})
+    for query in ['owner 1', 'report 00001', 'new report', 'stakeholder 2', 'reprot 0003', 'stakholder', 'ort 3']:
+        for rows in (None, owner_rows):
+            assert updated.search(query, 10, rows) == rebuilt.search(query, 10, rows)
+
+
+@pytest.mark.parametrize('catalogs', SEEDS, indirect=True)
+def test_link_cube_matches_aggregation(catalogs):
+    new = normalize_reports(catalogs[1])
+    cube = LinkCube(new)
+
+    for owner in owners(new):
+        owner_df = new if owner == "All Owners" else new[new['report_owner'] == owner]
+        for source_col, target_col in STAGE_PAIRS:
+            assert_links_equal(cube.links(owner, source_col, target_col),
+                               stage_links(owner_df, source_col, target_col))
+
+
+@pytest.mark.parametrize('catalogs', SEEDS, indirect=True)
+def test_updated_link_cube_matches_rebuild(catalogs):
+    old, new = (normalize_reports(raw) for raw in catalogs)
+    # A new owner and the last report of another also change the owner labels
+    new = new.copy()
+    new['report_owner'] = new['report_owner'].astype(object)
+    new.loc[len(new) - 1, 'report_owner'] = 'Owner 999'
+    last_owner = old['report_owner'].value_counts().index[-1]
+    new = new[new['report_owner'] != last_owner].reset_index(drop=True)
+    delta = CatalogDelta(old, new)
+    assert delta.monotonic and 'report_owner' in delta.distinct_changed
+
+    updated = LinkCube(old).updated(delta, new)
+    rebuilt = LinkCube(new)
+
+    for owner in owners(new) + [last_owner]:
+        for col in rebuilt._labels:
+            assert updated.nodes(owner, col) == rebuilt.nodes(owner, col)
+        for source_col, target_col in STAGE_PAIRS:
+            assert_links_equal(updated.links(owner, source_col, target_col),
+                               rebuilt.links(owner, source_col, target_col))
+
+
+@pytest.mark.parametrize('catalogs', SEEDS, indirect=True)
+def test_updated_name_ranks_match_rebuild(catalogs):
+    old, new = (normalize_reports(raw) for raw in catalogs)
+    # Repeated names are ranked in catalog order; appending them keeps the rows in order
+    new = new.copy()
+    new.loc[[len(new) - 2, len(new) - 1], 'report_name'] = new['report_name'].iloc[100]
+    delta = CatalogDelta(old, new)
+    assert delta.monotonic
+
+    ranks = name_ranks(old['report_name'].to_numpy())
+    updated = updated_name_ranks(ranks, delta, new['report_name'].to_numpy())
+    assert updated.tolist() == name_ranks(new['report_name'].to_numpy()).tolist()
+
+
+@pytest.fixture
+def app_catalog(tmp_path, monkeypatch):
+    """Point the app at a catalog file in tmp_path; returns a function writing a raw catalog to it"""
+    path = tmp_path / 'reports.csv'
+
+    def write(raw):
+        raw.to_csv(path, index=False)
+
+    write(generate_catalog(1, seed=0))
+    catalog = ReportCatalog(str(path), cache_path='')
+    catalog.on_change(dashboard.carry_over_cached_views)
+    monkeypatch.setattr(dashboard, 'catalog', catalog)
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+    yield write
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+
+
+def check_carried_over(quarters):
+    """Compare every view and response kept across the last catalog change with a rebuild"""
+    version = dashboard.catalog.version
+    kept_views = kept_responses = 0
+    for owner in owners(dashboard.catalog.frame):
+        for quarter, year in quarters:
+            view = dashboard.sankey_views.get(version, (owner, quarter, year, None, None))
+            if view is not None:
+                kept_views += 1
+                expected = dashboard.build_sankey_view(owner, quarter, year)
+                assert view.fig == expected.fig
+                assert view.stats == expected.stats
+                for kept, rebuilt in ((view.node_rows, expected.node_rows), (view.link_rows, expected.link_rows)):
+                    assert {k: rows.tolist() for k, rows in kept.items()} == \
+                           {k: rows.tolist() for k, rows in rebuilt.items()}
+
+            body = dashboard.sankey_cache.get(version, (owner, quarter, year, None, None, None))
+            if body is not None:
+                kept_responses += 1
+                assert body == dashboard.build_sankey_response(owner, quarter, year)
+    return kept_views, kept_responses
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_carried_over_views_match_rebuild(seed, app_catalog):
+    rng = np.random.default_rng(seed)
+    raw = generate_catalog(400, {'Report_Owner': 12, 'Stakeholder': 300}, seed=seed)
+    app_catalog(raw)
+    catalog = dashboard.catalog
+    client = dashboard.app.test_client()
+    quarters = [('', ''), ('2', '2026')]
+
+    def request_all():
+        for owner in owners(catalog.frame):
+            for quarter, year in quarters:
+                query = {'owner': owner, 'quarter': quarter, 'year': year}
+                assert client.get('/get_sankey', query_string=query).status_code == 200
+
+    # Removed, changed and added reports touch shared data sources and output
+    # types, so only views survive; responses need their node values untouched
+    request_all()
+    app_catalog(edit_catalog(raw, rng))
+    assert catalog.refresh()
+    kept_views, _ = check_carried_over(quarters)
+    assert kept_views
+
+    # Moving a report between two rare stakeholders leaves most responses valid
+    request_all()
+    edited = catalog.frame.copy()
+    edited['stakeholder'] = edited['stakeholder'].astype(object)
+    counts = edited['stakeholder'].value_counts()
+    rare = counts[counts == 1].index
+    edited.loc[edited['stakeholder'] == rare[0], 'stakeholder'] = rare[1]
+    app_catalog(edited.set_axis(raw.columns, axis=1))
+    assert catalog.refresh()
+    _, kept_responses = check_carried_over(quarters)
+    assert kept_responses
@@ -0,0 +1,59 @@
+# tests/test_export.py
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as dashboard
+import export
+from benchmarks.synthetic import generate_catalog
+from src.catalog import ReportCatalog
+
+
+@pytest.fixture
+def run_export(tmp_path, monkeypatch):
+    """Returns a function running export.main() with some arguments into tmp_path/out; returns the manifest"""
+    path = tmp_path / 'reports.csv'
+    generate_catalog(200, {'Report_Owner': 4}, seed=2).to_csv(path, index=False)
+    monkeypatch.setattr(dashboard, 'catalog', ReportCatalog(str(path), cache_path=''))
+    # Workers run in threads, so they see the catalog above
+    monkeypatch.setattr(export, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    out = tmp_path / 'out'
+
+    def run(*args):
+        monkeypatch.setattr(sys, 'argv', ['export.py', '--out', str(out), '--formats', 'html', 'json', *args])
+        export.main()
+        with open(out / export.MANIFEST) as f:
+            return {entry['name']: entry for entry in json.load(f)['figures']}
+
+    run.out = out
+    return run
+
+
+def test_changed_render_options_rewrite_figures(run_export):
+    first = run_export('--owners', 'Owner 1', '--plotlyjs', 'cdn')
+    assert not any(entry['skipped'] for entry in first.values())
+    cdn_sizes = {stem: (run_export.out / f"{stem}.html").stat().st_size for stem in first}
+
+    again = run_export('--owners', 'Owner 1', '--plotlyjs', 'cdn')
+    assert all(entry['skipped'] for entry in again.values())
+
+    inline = run_export('--owners', 'Owner 1')
+    assert not any(entry['skipped'] for entry in inline.values())
+    for stem, entry in inline.items():
+        assert entry['hash'] == first[stem]['hash']
+        assert entry['render']['html']['include_plotlyjs'] is True
+        # plotly.js is now embedded in the page
+        assert (run_export.out / f"{stem}.html").stat().st_size > cdn_sizes[stem] + 1_000_000
+
+
+def test_partial_export_keeps_other_owners(run_export):
+    both = run_export('--owners', 'Owner 1', 'Owner 2')
+    owner_2 = {stem: entry for stem, entry in both.items() if entry['owner'] == 'Owner 2'}
+    assert owner_2
+
+    partial = run_export('--owners', 'Owner 1', '--force')
+    assert {stem: partial[stem] for stem in owner_2} == owner_2
+    assert {entry['owner'] for entry in partial.values()} == {'Owner 1', 'Owner 2'}
@@ -0,0 +1,37 @@
+# tests/test_figure_json.py
+
+import json
+
+import plotly.graph_objects as go
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import normalize_reports
+from src.figure_json import figure_json
+from src.link_cube import LinkCube
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    return normalize_reports(generate_catalog(2000, {'Report_Owner': 20, 'Stakeholder': 60}, seed=7))
+
+
+@pytest.fixture(scope='module')
+def cube(catalog):
+    return LinkCube(catalog)
+
+
+@pytest.mark.parametrize('owner', ["All Owners", "Owner 0", "Owner 11"])
+@pytest.mark.parametrize('quarter, year', [('', ''), ('2', '2025'), ('2', '2026')])
+@pytest.mark.parametrize('top, min_link', [(None, None), (5, None), (None, 3), (5, 3)])
+def test_figure_json_matches_plotly(catalog, cube, owner, quarter, year, top, min_link):
+    fig = dashboard.build_sankey(catalog, owner, quarter, year, cube=cube, top=top, min_link=min_link)[0]
+
+    assert json.loads(figure_json(fig)) == json.loads(go.Figure(fig).to_json())
+
+
+def test_bucketed_figure_has_other_nodes(catalog, cube):
+    fig = dashboard.build_sankey(catalog, "All Owners", cube=cube, top=5)[0]
+
+    assert any(label.startswith("Other (") for label in fig["data"][0]["node"]["label"])
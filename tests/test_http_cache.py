@@ -0,0 +1,99 @@
+# tests/test_http_cache.py
+
+import gzip
+import threading
+
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import ReportCatalog
+
+
+@pytest.fixture
+def catalog_file(tmp_path, monkeypatch):
+    """Point the app at a catalog file in tmp_path; returns a function writing a synthetic catalog to it"""
+    path = tmp_path / 'reports.csv'
+
+    def write(rows, seed=0):
+        generate_catalog(rows, {'Report_Owner': 4}, seed=seed).to_csv(path, index=False)
+
+    write(200)
+    monkeypatch.setattr(dashboard, 'catalog', ReportCatalog(str(path), cache_path=''))
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+    yield write
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+
+
+def test_pinned_catalog_ignores_concurrent_reload(catalog_file):
+    catalog = dashboard.catalog
+    with catalog.pinned() as version:
+        df = catalog.frame
+        catalog_file(300, seed=1)
+        reload = threading.Thread(target=catalog.refresh)
+        reload.start()
+        reload.join()
+
+        assert catalog.version == version
+        assert catalog.frame is df
+        assert len(dashboard.report_index().frame) == len(df)
+
+    assert catalog.version != version
+    assert len(dashboard.report_index().frame) != len(df)
+
+
+def test_etag_names_the_version_the_body_was_built_from(catalog_file, monkeypatch):
+    client = dashboard.app.test_client()
+    build = dashboard.build_sankey_response
+
+    def reload_then_build(*args, **kwargs):
+        # Another thread reloads the catalog while this request is being served
+        catalog_file(300, seed=1)
+        reload = threading.Thread(target=dashboard.catalog.refresh)
+        reload.start()
+        reload.join()
+        return build(*args, **kwargs)
+
+    old_total = len(dashboard.catalog.frame)
+    monkeypatch.setattr(dashboard, 'build_sankey_response', reload_then_build)
+    first = client.get('/get_sankey')
+    monkeypatch.setattr(dashboard, 'build_sankey_response', build)
+
+    assert first.get_json()['stats']['total_reports'] == old_total
+    second = client.get('/get_sankey', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.get_json()['stats']['total_reports'] == len(dashboard.catalog.frame) != old_total
+
+
+@pytest.mark.parametrize('path', ['/get_owners', '/get_sankey', '/get_reports?node=0'])
+def test_if_none_match_returns_304(catalog_file, path):
+    client = dashboard.app.test_client()
+    first = client.get(path)
+    etag = first.headers['ETag']
+
+    second = client.get(path, headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+    assert client.get(path, headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_gzip_only_when_accepted(catalog_file):
+    client = dashboard.app.test_client()
+
+    plain = client.get('/get_sankey', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed = client.get('/get_sankey', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+
+    # The encoding is part of the ETag, so a cached identity body never validates a gzip request
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    revalidated = client.get('/get_sankey', headers={'Accept-Encoding': 'gzip',
+                                                     'If-None-Match': plain.headers['ETag']})
+    assert revalidated.status_code == 200
@@ -0,0 +1,42 @@
+# tests/test_links.py
+
+import numpy as np
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import normalize_reports
+from src.link_cube import LinkCube
+from src.links import STAGE_COLUMNS, stage_nodes
+
+
+@pytest.fixture(scope='module')
+def catalog():
+    """Synthetic catalog where a few reports have no stakeholder"""
+    raw = generate_catalog(500, {'Report_Owner': 8, 'Stakeholder': 30}, seed=5)
+    raw.loc[[3, 40, 41], 'Stakeholder'] = np.nan
+    return normalize_reports(raw)
+
+
+def test_stage_nodes_skip_missing_values(catalog):
+    nodes = stage_nodes(catalog, 'stakeholder')
+
+    assert nodes == sorted(catalog['stakeholder'].dropna().unique())
+    assert LinkCube(catalog).nodes("All Owners", 'stakeholder') == nodes
+
+
+@pytest.mark.parametrize('owner', ["All Owners", "Owner 0"])
+@pytest.mark.parametrize('quarter, year', [('', ''), ('2', '2026')])
+def test_missing_stakeholder_matches_cube(catalog, owner, quarter, year):
+    cube = LinkCube(catalog)
+    expected = dashboard.build_sankey(catalog, owner, quarter, year, cube=cube)
+    fig, all_nodes, link_reports, _ = dashboard.create_sankey(catalog, owner, quarter, year)
+
+    assert all_nodes == expected[1]
+    assert list(fig.data[0].link.value) == expected[0]['data'][0]['link']['value']
+    assert set(link_reports) == set(expected[2])
+
+
+def test_every_stage_has_nodes(catalog):
+    for col in STAGE_COLUMNS:
+        assert all(isinstance(node, str) for node in stage_nodes(catalog, col))
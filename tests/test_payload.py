@@ -0,0 +1,104 @@
+# tests/test_payload.py
+
+import json
+from itertools import accumulate
+
+import numpy as np
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import ReportCatalog
+from src.payload import page_rows
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / 'reports.csv'
+    generate_catalog(600, {'Report_Owner': 6, 'Stakeholder': 40}, seed=2).to_csv(path, index=False)
+    monkeypatch.setattr(dashboard, 'catalog', ReportCatalog(str(path), cache_path=''))
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+    yield dashboard.app.test_client()
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+
+
+def decode(reports, encoded):
+    """Report names of delta-encoded ids, as script.js decodes them"""
+    return {key: [reports[i] for i in accumulate(gaps)] for key, gaps in encoded.items()}
+
+
+@pytest.mark.parametrize('query', [
+    {},
+    {'owner': 'Owner 2'},
+    {'quarter': '2', 'year': '2026'},
+    {'top': '5', 'min_link': '2'},
+])
+def test_compact_format_decodes_to_default(client, query):
+    default = client.get('/get_sankey', query_string=query).get_json()
+    compact = client.get('/get_sankey', query_string={**query, 'format': 'compact'}).get_json()
+
+    assert compact['plot'] == json.loads(default['plot'])
+    assert compact['node_data'] == default['node_data']
+    assert compact['stats'] == default['stats']
+    assert decode(compact['reports'], compact['node_reports']) == default['node_reports']
+    assert decode(compact['reports'], compact['link_reports']) == default['link_reports']
+
+
+def test_page_rows_boundaries():
+    rows = np.array([7, 2, 9, 4, 0, 5])
+    keys = np.arange(10)[::-1]  # descending by row: 9 first
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = page_rows(rows, keys, cursor, limit=2)
+        pages.append(page.tolist())
+        if cursor is None:
+            break
+
+    assert pages == [[9, 7], [5, 4], [2, 0]]
+
+    # An exact multiple of the page size ends with a full page and no cursor
+    assert page_rows(rows, keys, None, limit=6)[1] is None
+    assert page_rows(rows, keys, None, limit=5)[1] == keys[2]
+
+
+def test_page_rows_past_the_end():
+    rows = np.array([1, 2, 3])
+    page, cursor = page_rows(rows, np.arange(4), cursor=3, limit=10)
+
+    assert page.tolist() == []
+    assert cursor is None
+
+
+def test_get_reports_pages_cover_the_node(client):
+    expected = client.get('/get_sankey').get_json()['node_reports']['0']
+
+    names, cursor, totals = [], None, set()
+    while True:
+        query = {'node': 0, 'limit': 7, 'sort': 'catalog'}
+        if cursor:
+            query['cursor'] = cursor
+        page = client.get('/get_reports', query_string=query).get_json()
+        assert len(page['reports']) <= 7
+        names.extend(page['reports'])
+        totals.add(page['total'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert names == expected
+    assert totals == {len(expected)}
+
+
+def test_get_reports_out_of_range(client):
+    total = client.get('/get_reports', query_string={'node': 0}).get_json()['total']
+
+    past_end = client.get('/get_reports', query_string={'node': 0, 'sort': 'catalog', 'cursor': 10 ** 9}).get_json()
+    assert past_end == {"reports": [], "total": total, "next_cursor": None}
+
+    assert client.get('/get_reports', query_string={'node': 10 ** 6}).get_json() == {"error": "No such node or link"}
+    assert client.get('/get_reports', query_string={'link': '0-0'}).get_json() == {"error": "No such node or link"}
+    assert 'error' in client.get('/get_reports', query_string={'node': 0, 'cursor': 'x'}).get_json()
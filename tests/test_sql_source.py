@@ -0,0 +1,65 @@
+# tests/test_sql_source.py
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_catalog
+from src.catalog import COLUMNS, ReportCatalog, normalize_reports
+from src.sql_source import sql_source_from_url
+
+
+@pytest.fixture
+def database(tmp_path):
+    """SQLite catalog table holding a small synthetic catalog"""
+    path = tmp_path / 'reports.db'
+    raw = generate_catalog(500, {'Report_Owner': 12, 'Stakeholder': 30}, seed=3)
+    with sqlite3.connect(path) as conn:
+        raw.set_axis(COLUMNS, axis=1).to_sql('reports', conn, index=False)
+    return path, raw
+
+
+def test_round_trip_matches_csv_normalization(database):
+    path, raw = database
+    catalog = ReportCatalog(sql_source_from_url(f"sqlite:///{path}", updated_column=None))
+
+    pd.testing.assert_frame_equal(catalog.frame, normalize_reports(raw))
+
+
+def test_reload_after_table_change(database):
+    path, raw = database
+    catalog = ReportCatalog(sql_source_from_url(f"sqlite:///{path}", updated_column=None))
+    version = catalog.version
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM reports WHERE report_owner = 'Owner 0'")
+
+    assert catalog.refresh()
+    assert catalog.version != version
+    assert 'Owner 0' not in set(catalog.frame['report_owner'].dropna())
+    assert catalog.changes[-1].delta.owners == {'Owner 0'}
+
+
+def test_source_error_keeps_last_version(database):
+    path, _ = database
+    source = sql_source_from_url(f"sqlite:///{path}", updated_column=None)
+    catalog = ReportCatalog(source)
+    df, version = catalog.snapshot()
+
+    source.table = 'missing_table'
+    assert not catalog.refresh()
+    assert catalog.frame is df
+    assert catalog.version == version
+
+    source.table = 'reports'
+    assert not catalog.refresh()
+    assert catalog.version == version
+
+
+def test_source_error_without_catalog_raises(database):
+    path, _ = database
+    catalog = ReportCatalog(sql_source_from_url(f"sqlite:///{path}", table='missing_table', updated_column=None))
+
+    with pytest.raises(sqlite3.OperationalError):
+        catalog.refresh()
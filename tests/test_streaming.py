@@ -0,0 +1,75 @@
+# tests/test_streaming.py
+
+import json
+import time
+
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import ReportCatalog
+from src.metrics import request_seconds
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = tmp_path / 'reports.csv'
+    generate_catalog(300, {'Report_Owner': 5}, seed=1).to_csv(path, index=False)
+    monkeypatch.setattr(dashboard, 'catalog', ReportCatalog(str(path), cache_path=''))
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+    yield dashboard.app.test_client()
+    dashboard.sankey_views.clear()
+
+
+def stream_lines(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def request_count():
+    series = request_seconds._series.get(('get_sankey', '200'))
+    return series[2] if series else 0
+
+
+def test_ndjson_stream_lines(client):
+    response = client.get('/get_sankey', query_string={'format': 'ndjson'}, headers={'Accept-Encoding': ''})
+
+    types = [line['type'] for line in stream_lines(response)]
+    assert types[:2] == ['plot', 'stats']
+    assert types[-1] == 'end'
+    assert 'headers;dur=' in response.headers['Server-Timing']
+
+
+def test_ndjson_error_after_first_line(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    # Fails while serializing the node report lists, after the plot and stats lines
+    monkeypatch.setattr(dashboard, 'STREAM_CHUNK_REPORTS', 1)
+    monkeypatch.setattr(dashboard, 'dumps', lambda obj: fail() if obj.get('type') == 'node_reports'
+                        else json.dumps(obj))
+    response = client.get('/get_sankey', query_string={'format': 'ndjson'}, headers={'Accept-Encoding': ''})
+
+    lines = stream_lines(response)
+    assert [line['type'] for line in lines[:2]] == ['plot', 'stats']
+    assert lines[-1] == {"type": "error", "error": "The diagram could not be built"}
+
+
+def test_ndjson_latency_recorded_when_stream_ends(client, monkeypatch):
+    original = dashboard.figure_json
+
+    def slow_figure_json(fig):
+        time.sleep(0.05)
+        return original(fig)
+
+    monkeypatch.setattr(dashboard, 'figure_json', slow_figure_json)
+    before = request_count()
+    total = request_seconds._series.get(('get_sankey', '200'), [None, 0.0])[1]
+
+    response = client.get('/get_sankey', query_string={'format': 'ndjson'}, buffered=False)
+    assert request_count() == before
+    response.get_data()
+    response.close()
+
+    assert request_count() == before + 1
+    assert request_seconds._series[('get_sankey', '200')][1] - total >= 0.05
@@ -0,0 +1,58 @@
+# tests/test_timeline.py
+
+import json
+
+import pytest
+
+import app as dashboard
+from benchmarks.synthetic import generate_catalog
+from src.catalog import ReportCatalog
+
+
+@pytest.fixture
+def app_catalog(tmp_path, monkeypatch):
+    """Point the app at a synthetic catalog file in tmp_path"""
+    path = tmp_path / 'reports.csv'
+    generate_catalog(400, {'Report_Owner': 6, 'Stakeholder': 30}, seed=3).to_csv(path, index=False)
+    monkeypatch.setattr(dashboard, 'catalog', ReportCatalog(str(path), cache_path=''))
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+    yield dashboard.catalog
+    dashboard.sankey_cache.clear()
+    dashboard.sankey_views.clear()
+
+
+@pytest.mark.parametrize('owner', ["All Owners", "Owner 1"])
+@pytest.mark.parametrize('top', [None, 4])
+def test_timeline_frames_match_views(app_catalog, owner, top):
+    timeline = json.loads(dashboard.build_timeline_response(owner, top))
+    base = timeline['plot']['data'][0]
+    labels = base['node']['label']
+    links = {(source, target): i for i, (source, target) in enumerate(zip(base['link']['source'],
+                                                                           base['link']['target']))}
+
+    assert len(timeline['frames']) == len(dashboard.ROADMAP_QUARTERS)
+    for frame, (quarter, year) in zip(timeline['frames'], dashboard.ROADMAP_QUARTERS):
+        dashboard.sankey_views.clear()
+        view = dashboard.build_sankey_view(owner, quarter, year, top)
+        nodes = frame['nodes']
+
+        # The frame's deltas applied to the base give the view's links and node counts
+        values = list(base['link']['value'])
+        for i, value in frame['values']:
+            values[i] = value
+        counts = {int(i): count for i, count in timeline['node_counts'].items()}
+        counts.update(dict(frame['node_counts']))
+
+        link = view.fig['data'][0]['link']
+        expected = [0] * len(values)
+        for source, target, value in zip(link['source'], link['target'], link['value']):
+            expected[links[(nodes[source], nodes[target])]] = value
+        assert values == expected
+
+        assert [labels[i] for i in nodes] == view.all_nodes
+        expected_counts = {nodes[k]: len(rows) for k, rows in view.node_rows.items()}
+        assert {i: count for i, count in counts.items() if count} == \
+               {i: count for i, count in expected_counts.items() if count}
+        assert frame['title'] == view.fig['layout']['title']['text']
+        assert frame['stats'] == json.loads(json.dumps(view.stats))
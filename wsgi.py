@@ -0,0 +1,24 @@
+# wsgi.py
+import os
+
+from app import app, catalog, link_cube, report_index, search_index, warm_sankey_cache
+
+
+def create_app():
+    """
+    Return the Flask app with the report catalog already loaded
+
+    Called once in the server's master process (see gunicorn.conf.py), so the
+    parsed catalog, its indexes and link cube, and any warmed responses are
+    shared by every forked worker instead of being loaded again per worker.
+    """
+    catalog.refresh()
+    report_index()
+    link_cube()
+    search_index()
+    if os.environ.get('SANKEY_CACHE_WARMUP'):
+        warm_sankey_cache()
+    return app
+
+
+application = create_app()